@@ -0,0 +1,236 @@
+"""
+# Anomaly Detector — Streaming Z-Score Detection per Metric Key
+
+Day 8 Q15 says that modelling the normal distribution of data lets you flag
+anomalies as low-probability points; the Day 8 code computes mean/std once on
+a static list. `StreamingDetector` does it online for thousands of metrics.
+
+## Per-key state (O(1) work per event)
+- **EWMA mean / variance**: exponentially weighted, `alpha` controls memory.
+- **Robust median / MAD**: frugal stochastic-approximation quantile
+  estimates that step towards each new value (and each new absolute
+  deviation) by a fraction of the EWMA standard deviation; the fraction
+  starts at 1/count and settles at `robust_step`.
+- **Scores**: classic z-score `(x - mean) / std` and robust z-score
+  `0.6745 * (x - median) / MAD`; an event is anomalous when either exceeds
+  the threshold after `warmup` events for that key.
+
+## Layout
+State lives in flat NumPy arrays (one slot per key, grown by doubling), so
+thousands of keys cost a few arrays rather than thousands of objects.
+Micro-batches are scored with vectorized updates; repeated keys inside a
+batch are applied in arrival order.
+
+A key can be warm-started from a `SummaryStats` computed offline.
+
+---
+"""
+
+import time
+
+import numpy as np
+
+# Scale factor turning a MAD into a normal-consistent standard deviation
+MAD_TO_STD = 1.4826
+
+_FIELDS = ("count", "mean", "var", "median", "mad")
+
+
+class StreamingDetector:
+    """Online EWMA + median/MAD anomaly detector with an array-backed key table."""
+
+    def __init__(self, alpha=0.02, threshold=4.0, warmup=50, robust_step=0.01,
+                 update_on_anomaly=True, capacity=1024):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.robust_step = robust_step
+        self.update_on_anomaly = update_on_anomaly
+        self.slots = {}
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.mean = np.zeros(capacity)
+        self.var = np.zeros(capacity)
+        self.median = np.zeros(capacity)
+        self.mad = np.zeros(capacity)
+
+    # 1. Key table
+    def _grow(self, needed):
+        capacity = len(self.count)
+        while capacity < needed:
+            capacity *= 2
+        for name in _FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _slot_ids(self, keys):
+        slots = self.slots
+        ids = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(slots)
+            ids[i] = slot
+        if len(slots) > len(self.count):
+            self._grow(len(slots))
+        return ids
+
+    def seed_from_summary(self, key, summary):
+        """Warm-starts a key from a summary_stats.SummaryStats computed offline."""
+        slot = self._slot_ids([key])[0]
+        q25, q75 = summary.quantile([0.25, 0.75])
+        self.count[slot] = summary.count
+        self.mean[slot] = summary.mean
+        self.var[slot] = summary.variance(ddof=0)
+        self.median[slot] = summary.median
+        self.mad[slot] = (q75 - q25) / 2  # IQR/2 equals the MAD for symmetric data
+
+    # 2. Scoring
+    def _apply(self, ids, x):
+        """Scores x against the current state of unique slots ids, then updates them."""
+        count = self.count[ids]
+        mean = self.mean[ids]
+        var = self.var[ids]
+        median = self.median[ids]
+        mad = self.mad[ids]
+
+        first = count == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(var > 0, (x - mean) / np.sqrt(var), 0.0)
+            robust_z = np.where(mad > 0, (x - median) / (MAD_TO_STD * mad), 0.0)
+        anomalous = (count >= self.warmup) & (
+            (np.abs(z) > self.threshold) | (np.abs(robust_z) > self.threshold))
+
+        update = np.ones(len(ids), dtype=bool) if self.update_on_anomaly else ~anomalous
+        a = self.alpha
+        delta = x - mean
+        new_mean = np.where(first, x, mean + a * delta)
+        new_var = np.where(first, 0.0, (1 - a) * (var + a * delta * delta))
+
+        # Frugal quantile steps scale with the EWMA std so they adapt to the metric.
+        # Robbins-Monro style: large steps for new keys, settling to robust_step
+        rate = np.maximum(self.robust_step, 1.0 / (count + 1))
+        step = rate * np.sqrt(new_var)
+        new_median = np.where(first, x, median + step * np.sign(x - median))
+        deviation = np.abs(x - new_median)
+        new_mad = np.where(first, 0.0, np.where(
+            mad > 0, np.maximum(mad + step * np.sign(deviation - mad), 0.0), deviation))
+
+        upd = ids[update]
+        self.count[upd] = count[update] + 1
+        self.mean[upd] = new_mean[update]
+        self.var[upd] = new_var[update]
+        self.median[upd] = new_median[update]
+        self.mad[upd] = new_mad[update]
+        return z, robust_z, anomalous
+
+    def score_batch(self, keys, values):
+        """Scores a micro-batch in arrival order; returns (z, robust_z, anomalous) arrays."""
+        values = np.asarray(values, dtype=np.float64)
+        ids = self._slot_ids(keys)
+        n = len(ids)
+        z = np.empty(n)
+        robust_z = np.empty(n)
+        anomalous = np.empty(n, dtype=bool)
+
+        # Occurrence rank of each event within its key: rank r events see state after r-1
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        starts = np.r_[True, sorted_ids[1:] != sorted_ids[:-1]]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(n) - group_start
+
+        for r in range(rank.max() + 1 if n else 0):
+            sel = np.flatnonzero(rank == r)
+            z[sel], robust_z[sel], anomalous[sel] = self._apply(ids[sel], values[sel])
+        return z, robust_z, anomalous
+
+    def score(self, key, value):
+        """Scores one event with scalar arithmetic; returns (z, robust_z, is_anomaly)."""
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self._slot_ids([key])[0]
+        x = float(value)
+        count = int(self.count[slot])
+        mean, var = float(self.mean[slot]), float(self.var[slot])
+        median, mad = float(self.median[slot]), float(self.mad[slot])
+
+        z = (x - mean) / var ** 0.5 if var > 0 else 0.0
+        robust_z = (x - median) / (MAD_TO_STD * mad) if mad > 0 else 0.0
+        is_anomaly = count >= self.warmup and (
+            abs(z) > self.threshold or abs(robust_z) > self.threshold)
+        if is_anomaly and not self.update_on_anomaly:
+            return z, robust_z, is_anomaly
+
+        if count == 0:
+            mean, var, median, mad = x, 0.0, x, 0.0
+        else:
+            a = self.alpha
+            delta = x - mean
+            mean += a * delta
+            var = (1 - a) * (var + a * delta * delta)
+            step = max(self.robust_step, 1.0 / (count + 1)) * var ** 0.5
+            median += step if x > median else (-step if x < median else 0.0)
+            deviation = abs(x - median)
+            if mad > 0:
+                mad = max(mad + (step if deviation > mad else (-step if deviation < mad else 0.0)), 0.0)
+            else:
+                mad = deviation
+        self.count[slot] = count + 1
+        self.mean[slot], self.var[slot] = mean, var
+        self.median[slot], self.mad[slot] = median, mad
+        return z, robust_z, is_anomaly
+
+    def state(self, key):
+        """Returns the current per-key estimates as a dict."""
+        slot = self.slots[key]
+        return {
+            "count": int(self.count[slot]),
+            "mean": self.mean[slot],
+            "std": np.sqrt(self.var[slot]),
+            "median": self.median[slot],
+            "mad": self.mad[slot],
+        }
+
+
+# 3. Throughput benchmark
+def benchmark(n_events=2000000, n_keys=5000, batch_size=10000, seed=0):
+    """Prints events per second for micro-batch and single-event scoring."""
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, n_keys, size=n_events)
+    values = rng.normal(100, 10, size=n_events)
+    spikes = rng.random(n_events) < 0.001
+    values[spikes] += 200
+
+    detector = StreamingDetector()
+    start = time.perf_counter()
+    flagged = 0
+    for s in range(0, n_events, batch_size):
+        flagged += detector.score_batch(keys[s:s + batch_size], values[s:s + batch_size])[2].sum()
+    elapsed = time.perf_counter() - start
+    print(f"Micro-batches of {batch_size}: {n_events / elapsed:,.0f} events/s "
+          f"({flagged} flagged, {spikes.sum()} injected spikes)")
+
+    single = 50000
+    start = time.perf_counter()
+    for key, value in zip(keys[:single].tolist(), values[:single].tolist()):
+        detector.score(key, value)
+    elapsed = time.perf_counter() - start
+    print(f"Single events: {single / elapsed:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    from summary_stats import SummaryStats
+
+    # Day 8 data as the "normal" history for one metric
+    data = [12, 15, 12, 18, 22, 15, 18, 20, 16, 18, 17, 19, 21, 22, 14]
+    detector = StreamingDetector(warmup=10)
+    detector.seed_from_summary("latency_ms", SummaryStats().update(data))
+    for value in [17, 19, 16, 45, 18]:
+        z, robust_z, is_anomaly = detector.score("latency_ms", value)
+        print(f"value={value:>3}  z={z:6.2f}  robust_z={robust_z:6.2f}  anomaly={is_anomaly}")
+    print("State:", detector.state("latency_ms"))
+
+    benchmark()
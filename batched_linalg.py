@@ -0,0 +1,172 @@
+"""
+# Batched Linear Algebra — Determinants, Inverses and Products of Tiny Matrices
+
+Day 9 calls `np.linalg.det` and `np.linalg.inv` on one 2×2 matrix. For
+millions of 2×2 to 4×4 blocks (e.g. covariance blocks) a Python loop over
+those calls spends nearly all of its time in per-call overhead. This module
+works on stacked arrays of shape `(N, k, k)`:
+
+- **k ≤ 3**: closed-form determinants (Sarrus / cofactor expansion) and
+  inverses (adjugate / determinant), fully vectorized over N.
+- **k > 3**: NumPy's stacked `np.linalg` routines, run only on the
+  non-singular matrices.
+- **Singular matrices are flagged with a mask** instead of raising
+  `LinAlgError` on the first bad one. Their inverse rows are NaN.
+
+A matrix counts as singular when `|det|` is below `tol` times the Hadamard
+bound (product of row norms), which makes the test scale-invariant.
+
+---
+"""
+
+import time
+
+import numpy as np
+
+
+def _as_stack(a):
+    a = np.asarray(a, dtype=np.float64)
+    if a.ndim == 2:
+        a = a[np.newaxis]
+    if a.ndim != 3 or a.shape[1] != a.shape[2]:
+        raise ValueError(f"Expected shape (N, k, k), got {a.shape}")
+    return a
+
+
+# 1. Determinants
+def det(a):
+    """Determinants of a stack of square matrices, shape (N,)."""
+    a = _as_stack(a)
+    k = a.shape[1]
+    if k == 1:
+        return a[:, 0, 0].copy()
+    if k == 2:
+        return a[:, 0, 0] * a[:, 1, 1] - a[:, 0, 1] * a[:, 1, 0]
+    if k == 3:
+        return (a[:, 0, 0] * (a[:, 1, 1] * a[:, 2, 2] - a[:, 1, 2] * a[:, 2, 1])
+                - a[:, 0, 1] * (a[:, 1, 0] * a[:, 2, 2] - a[:, 1, 2] * a[:, 2, 0])
+                + a[:, 0, 2] * (a[:, 1, 0] * a[:, 2, 1] - a[:, 1, 1] * a[:, 2, 0]))
+    return np.linalg.det(a)
+
+
+def singular_mask(a, d=None, tol=1e-12):
+    """True where |det| is negligible relative to the Hadamard bound."""
+    a = _as_stack(a)
+    if d is None:
+        d = det(a)
+    bound = np.prod(np.linalg.norm(a, axis=2), axis=1)
+    return ~(np.abs(d) > tol * bound)
+
+
+# 2. Inverses
+def _adjugate(a):
+    """Adjugate (transposed cofactor matrix) for k <= 3."""
+    k = a.shape[1]
+    adj = np.empty_like(a)
+    if k == 1:
+        adj[:] = 1.0
+    elif k == 2:
+        adj[:, 0, 0] = a[:, 1, 1]
+        adj[:, 0, 1] = -a[:, 0, 1]
+        adj[:, 1, 0] = -a[:, 1, 0]
+        adj[:, 1, 1] = a[:, 0, 0]
+    else:
+        # Cofactor C[i, j] goes to adj[j, i]
+        for i in range(3):
+            i1, i2 = (i + 1) % 3, (i + 2) % 3
+            for j in range(3):
+                j1, j2 = (j + 1) % 3, (j + 2) % 3
+                adj[:, j, i] = a[:, i1, j1] * a[:, i2, j2] - a[:, i1, j2] * a[:, i2, j1]
+    return adj
+
+
+def inv(a, tol=1e-12):
+    """Returns (inverses, singular) for a stack; singular inverses are NaN."""
+    a = _as_stack(a)
+    k = a.shape[1]
+    d = det(a)
+    singular = singular_mask(a, d, tol)
+    out = np.full_like(a, np.nan)
+    ok = ~singular
+    if k <= 3:
+        out[ok] = _adjugate(a[ok]) / d[ok, np.newaxis, np.newaxis]
+    elif ok.any():
+        out[ok] = np.linalg.inv(a[ok])
+    return out, singular
+
+
+# 3. Products and solves
+def matmul(a, b):
+    """Batched matrix product of stacks (N, k, m) @ (N, m, p) or broadcastable shapes."""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.shape[-1] != b.shape[-2]:
+        raise ValueError(f"Inner dimensions do not align: {a.shape} @ {b.shape}")
+    if a.ndim == 3 and b.ndim == 3 and a.shape[1:] == (2, 2) and b.shape[1:] == (2, 2):
+        # Explicit 2x2 product avoids matmul's per-matrix loop overhead
+        out = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.result_type(a, b))
+        out[:, 0, 0] = a[:, 0, 0] * b[:, 0, 0] + a[:, 0, 1] * b[:, 1, 0]
+        out[:, 0, 1] = a[:, 0, 0] * b[:, 0, 1] + a[:, 0, 1] * b[:, 1, 1]
+        out[:, 1, 0] = a[:, 1, 0] * b[:, 0, 0] + a[:, 1, 1] * b[:, 1, 0]
+        out[:, 1, 1] = a[:, 1, 0] * b[:, 0, 1] + a[:, 1, 1] * b[:, 1, 1]
+        return out
+    return np.matmul(a, b)
+
+
+def solve(a, b, tol=1e-12):
+    """Solves a[i] x = b[i] for each matrix; returns (x, singular) with NaN for singular."""
+    inverse, singular = inv(a, tol)
+    b = np.asarray(b, dtype=np.float64)
+    if b.ndim == 2:
+        return np.einsum("nij,nj->ni", inverse, b), singular
+    return matmul(inverse, b), singular
+
+
+# 4. Benchmark against a Python loop over the Day 9 calls
+def benchmark(n=200000, k=2, seed=0):
+    rng = np.random.default_rng(seed)
+    a = rng.standard_normal((n, k, k))
+    a[::1000] = 0.0  # some singular matrices
+    b = rng.standard_normal((n, k, k))
+
+    start = time.perf_counter()
+    for m1, m2 in zip(a, b):
+        np.linalg.det(m1)
+        try:
+            np.linalg.inv(m1)
+        except np.linalg.LinAlgError:
+            pass
+        m1 @ m2
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    det(a)
+    inv(a)
+    matmul(a, b)
+    batched = time.perf_counter() - start
+    print(f"k={k}, N={n:,}: Python loop {loop:.3f} s, batched {batched:.4f} s, "
+          f"speed-up {loop / batched:,.0f}x")
+
+
+if __name__ == "__main__":
+    # Day 9 matrices
+    m1 = np.array([[1, 2], [3, 4]])
+    m2 = np.array([[5, 6], [7, 8]])
+    singular = np.array([[1, 2], [2, 4]])
+    stack = np.stack([m1, m2, singular])
+
+    print("Determinants:", det(stack), "np.linalg:", np.linalg.det(stack))
+    inverse, mask = inv(stack)
+    print("Inverse of m1:\n", inverse[0])
+    print("Singular mask:", mask)
+    print("m1 @ m2:\n", matmul(stack[:1], stack[1:2])[0])
+
+    rng = np.random.default_rng(1)
+    for k in (2, 3, 4):
+        a = rng.standard_normal((1000, k, k))
+        inverse, mask = inv(a)
+        print(f"k={k} matches np.linalg:", np.allclose(det(a), np.linalg.det(a)),
+              np.allclose(inverse, np.linalg.inv(a)), "singular:", mask.sum())
+
+    for k in (2, 3, 4):
+        benchmark(k=k)
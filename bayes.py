@@ -0,0 +1,184 @@
+"""
+# Bayes — Vectorized Bayesian Updating for Many Entities
+
+Day 10 Q10 updates one scalar prior (`P_A = 0.01`) with one test result
+using module-level floats. This module performs the same update for
+millions of entities at once, as evidence streams in:
+
+- **Binary hypotheses** are stored as **log-odds**. Bayes' rule then turns
+  into addition, `logit(P(A|B)) = logit(P(A)) + log(P(B|A) / P(B|¬A))`, so
+  long evidence streams neither underflow nor lose precision near 0 or 1.
+- **Several hypotheses per entity** are stored as log-probabilities and
+  renormalized with `logsumexp`.
+- Evidence arrives in **batches** of `(entity id, likelihood)` pairs. Repeated
+  ids in a batch are folded in with `np.add.at`, so order inside a batch
+  does not matter (updates commute).
+- **Conjugate updates** in closed form: Beta-Binomial for success rates and
+  Dirichlet-Multinomial for category frequencies; each update is a count
+  addition.
+
+---
+"""
+
+import time
+
+import numpy as np
+from scipy import special, stats
+
+
+# 1. Scalar-style helper (the Day 10 formula, vectorized)
+def posterior(prior, p_evidence_given_h, p_evidence_given_not_h):
+    """P(H | E) for arrays of priors and likelihoods, computed in log-odds space."""
+    log_odds = special.logit(prior) + (np.log(p_evidence_given_h)
+                                       - np.log(p_evidence_given_not_h))
+    return special.expit(log_odds)
+
+
+# 2. Binary beliefs per entity
+class BinaryBeliefs:
+    """P(H) for N entities stored as log-odds; evidence adds log-likelihood ratios."""
+
+    def __init__(self, prior, n=None):
+        prior = np.asarray(prior, dtype=np.float64)
+        if n is not None:
+            prior = np.broadcast_to(prior, (n,))
+        self.log_odds = special.logit(prior).astype(np.float64)
+
+    def update(self, ids, p_evidence_given_h, p_evidence_given_not_h):
+        """Folds a batch of evidence into entities ids (ids may repeat)."""
+        llr = np.log(p_evidence_given_h) - np.log(p_evidence_given_not_h)
+        self.update_log_ratio(ids, llr)
+        return self
+
+    def update_log_ratio(self, ids, log_likelihood_ratio):
+        """Same as update, for precomputed log-likelihood ratios."""
+        np.add.at(self.log_odds, ids, log_likelihood_ratio)
+        return self
+
+    def probabilities(self, ids=None):
+        log_odds = self.log_odds if ids is None else self.log_odds[ids]
+        return special.expit(log_odds)
+
+
+# 3. Several hypotheses per entity
+class CategoricalBeliefs:
+    """P(H_j) for N entities and K hypotheses, kept as normalized log-probabilities."""
+
+    def __init__(self, prior, n=None):
+        prior = np.asarray(prior, dtype=np.float64)
+        if n is not None:
+            prior = np.broadcast_to(prior, (n, prior.shape[-1]))
+        self.log_p = np.log(prior) - np.log(prior.sum(axis=-1, keepdims=True))
+
+    def update(self, ids, likelihoods):
+        """likelihoods[i, j] = P(evidence_i | H_j) for entity ids[i]."""
+        return self.update_log(ids, np.log(likelihoods))
+
+    def update_log(self, ids, log_likelihoods):
+        touched = np.unique(ids)
+        np.add.at(self.log_p, ids, log_likelihoods)
+        rows = self.log_p[touched]
+        self.log_p[touched] = rows - special.logsumexp(rows, axis=1, keepdims=True)
+        return self
+
+    def probabilities(self, ids=None):
+        log_p = self.log_p if ids is None else self.log_p[ids]
+        return np.exp(log_p)
+
+    def map_hypothesis(self):
+        """Most probable hypothesis per entity."""
+        return np.argmax(self.log_p, axis=1)
+
+
+# 4. Conjugate updates
+class BetaBinomial:
+    """Beta(alpha, beta) posterior over a success rate for each of N entities."""
+
+    def __init__(self, alpha=1.0, beta=1.0, n=1):
+        self.alpha = np.full(n, alpha, dtype=np.float64)
+        self.beta = np.full(n, beta, dtype=np.float64)
+
+    def update(self, ids, successes, trials=1):
+        """Adds observed successes out of trials for entities ids (ids may repeat)."""
+        successes = np.asarray(successes, dtype=np.float64)
+        failures = np.asarray(trials, dtype=np.float64) - successes
+        np.add.at(self.alpha, ids, successes)
+        np.add.at(self.beta, ids, np.broadcast_to(failures, successes.shape))
+        return self
+
+    def mean(self):
+        return self.alpha / (self.alpha + self.beta)
+
+    def var(self):
+        total = self.alpha + self.beta
+        return self.alpha * self.beta / (total * total * (total + 1))
+
+    def credible_interval(self, level=0.95):
+        tail = (1 - level) / 2
+        return (stats.beta.ppf(tail, self.alpha, self.beta),
+                stats.beta.ppf(1 - tail, self.alpha, self.beta))
+
+
+class DirichletMultinomial:
+    """Dirichlet(alpha) posterior over K category probabilities for each of N entities."""
+
+    def __init__(self, alpha, n=1):
+        alpha = np.asarray(alpha, dtype=np.float64)
+        self.alpha = np.array(np.broadcast_to(alpha, (n, alpha.shape[-1])))
+
+    def update(self, ids, counts):
+        """Adds category counts (rows of length K) for entities ids."""
+        np.add.at(self.alpha, ids, counts)
+        return self
+
+    def update_categories(self, ids, categories):
+        """Adds one observation of category categories[i] for entity ids[i]."""
+        np.add.at(self.alpha, (ids, categories), 1.0)
+        return self
+
+    def mean(self):
+        return self.alpha / self.alpha.sum(axis=1, keepdims=True)
+
+
+# 5. Throughput benchmark
+def benchmark(n_entities=1000000, n_updates=10000000, batch_size=1000000, seed=0):
+    rng = np.random.default_rng(seed)
+    beliefs = BinaryBeliefs(0.01, n=n_entities)
+    start = time.perf_counter()
+    for _ in range(n_updates // batch_size):
+        ids = rng.integers(0, n_entities, size=batch_size)
+        positive = rng.random(batch_size) < 0.1
+        beliefs.update(ids, np.where(positive, 0.8, 0.2), np.where(positive, 0.1, 0.9))
+    elapsed = time.perf_counter() - start
+    print(f"Binary log-odds updates: {n_updates / elapsed:,.0f} updates/s")
+
+    beta = BetaBinomial(n=n_entities)
+    start = time.perf_counter()
+    for _ in range(n_updates // batch_size):
+        ids = rng.integers(0, n_entities, size=batch_size)
+        beta.update(ids, rng.random(batch_size) < 0.3)
+    elapsed = time.perf_counter() - start
+    print(f"Beta-Binomial updates:   {n_updates / elapsed:,.0f} updates/s")
+
+
+if __name__ == "__main__":
+    # Day 10 Q10: P(disease | positive test)
+    print("Posterior P(A|B):", posterior(0.01, 0.8, 0.1))
+
+    # The same update for three patients, then a second test for patient 0
+    patients = BinaryBeliefs([0.01, 0.05, 0.20])
+    patients.update([0, 1, 2], 0.8, 0.1)
+    print("After one positive test:", patients.probabilities())
+    patients.update([0], 0.8, 0.1)
+    print("Patient 0 after a second positive test:", patients.probabilities([0]))
+
+    # Log space survives long evidence streams where direct products underflow
+    stream = BinaryBeliefs(0.5, n=1).update(np.zeros(5000, dtype=int), 0.2, 0.21)
+    print("After 5,000 weak pieces of evidence:", stream.probabilities(),
+          "(direct product of likelihoods:", 0.2 ** 5000, ")")
+
+    # Conjugate update: click-through rates
+    ctr = BetaBinomial(1, 1, n=2).update([0, 0, 1], [3, 40, 1], [10, 100, 2])
+    print("Beta posterior means:", ctr.mean(), "95% intervals:", ctr.credible_interval())
+
+    benchmark()
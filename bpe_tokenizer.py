@@ -0,0 +1,240 @@
+"""
+# BPE Tokenizer — Byte-Pair Encoding with a Cached Merge Table
+
+The LLM+RAG notes explain that the tokenizer (BPE / WordPiece) determines
+input length, and with it cost and speed. This is a local byte-level BPE
+tokenizer for estimating prompt sizes offline, before any model is called.
+
+## Design
+- **Byte-level**: the base vocabulary is the 256 byte values, so any text
+  round-trips exactly and there are no unknown tokens.
+- **Pre-tokenization** splits text into word-like pieces (a leading space
+  stays attached to its word, as in GPT-2). Merges never cross pieces.
+- **Training** counts pair frequencies over *distinct* pieces weighted by
+  their frequency. After each merge it updates only the pieces that contain
+  the merged pair, and it finds the best pair through a lazy max-heap.
+- **Merge table**: merge r creates token id `256 + r` from the pair
+  `(left[r], right[r])`. The two int32 arrays are the whole model; lookup uses
+  a dict keyed by `left << 32 | right`.
+- **LRU cache** of encoded pieces: natural text repeats the same words
+  constantly, so most pieces are encoded once.
+- `encode_batch` spreads large batches across a process pool.
+
+---
+"""
+
+import heapq
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+PRETOKEN_PATTERN = re.compile(r" ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+")
+
+# Tokenizer used by encode_batch worker processes (set by _init_worker)
+_WORKER_TOKENIZER = None
+
+
+def pretokenize(text):
+    """Splits text into the pieces BPE merges are applied within."""
+    return PRETOKEN_PATTERN.findall(text)
+
+
+def _pairs(symbols):
+    return zip(symbols, symbols[1:])
+
+
+class BPETokenizer:
+    """Byte-level BPE tokenizer backed by two int32 merge arrays."""
+
+    def __init__(self, left=(), right=(), cache_size=65536):
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.cache_size = cache_size
+        self._build()
+
+    def _build(self):
+        """Builds the rank lookup, byte strings per id and the piece cache."""
+        left, right = self.left.tolist(), self.right.tolist()
+        self._ranks = {(a << 32) | b: r for r, (a, b) in enumerate(zip(left, right))}
+        vocab = [bytes([i]) for i in range(256)]
+        for a, b in zip(left, right):
+            vocab.append(vocab[a] + vocab[b])
+        self._vocab = vocab
+        self._encode_piece = lru_cache(maxsize=self.cache_size)(self._encode_piece_uncached)
+
+    @property
+    def vocab_size(self):
+        return 256 + len(self.left)
+
+    # 1. Training
+    @classmethod
+    def train(cls, texts, vocab_size, min_frequency=2, **kwargs):
+        """Learns vocab_size - 256 merges from an iterable of texts."""
+        piece_counts = Counter()
+        for text in texts:
+            piece_counts.update(pretokenize(text))
+        words = [list(piece.encode("utf-8", "surrogateescape")) for piece in piece_counts]
+        freqs = list(piece_counts.values())
+
+        pair_counts = Counter()
+        pair_where = {}
+        for w, (symbols, freq) in enumerate(zip(words, freqs)):
+            for pair in _pairs(symbols):
+                pair_counts[pair] += freq
+                pair_where.setdefault(pair, set()).add(w)
+        heap = [(-count, pair) for pair, count in pair_counts.items()]
+        heapq.heapify(heap)
+
+        left, right = [], []
+        while len(left) < vocab_size - 256 and heap:
+            neg, pair = heapq.heappop(heap)
+            if pair_counts.get(pair, 0) != -neg:
+                continue  # stale heap entry
+            if -neg < min_frequency:
+                break
+            new_id = 256 + len(left)
+            left.append(pair[0])
+            right.append(pair[1])
+
+            changed = set()
+            for w in pair_where.pop(pair, ()):
+                symbols, freq = words[w], freqs[w]
+                for p in _pairs(symbols):
+                    pair_counts[p] -= freq
+                    changed.add(p)
+                merged = []
+                i = 0
+                while i < len(symbols):
+                    if i + 1 < len(symbols) and (symbols[i], symbols[i + 1]) == pair:
+                        merged.append(new_id)
+                        i += 2
+                    else:
+                        merged.append(symbols[i])
+                        i += 1
+                words[w] = merged
+                for p in _pairs(merged):
+                    pair_counts[p] += freq
+                    pair_where.setdefault(p, set()).add(w)
+                    changed.add(p)
+            pair_counts.pop(pair, None)
+            for p in changed:
+                count = pair_counts.get(p, 0)
+                if count > 0:
+                    heapq.heappush(heap, (-count, p))
+                else:
+                    pair_counts.pop(p, None)
+        return cls(left, right, **kwargs)
+
+    # 2. Encoding and decoding
+    def _encode_piece_uncached(self, piece):
+        symbols = list(piece.encode("utf-8", "surrogateescape"))
+        ranks = self._ranks
+        while len(symbols) > 1:
+            best_rank, best_i = None, -1
+            for i in range(len(symbols) - 1):
+                rank = ranks.get((symbols[i] << 32) | symbols[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank, best_i = rank, i
+            if best_rank is None:
+                break
+            symbols[best_i:best_i + 2] = [256 + best_rank]
+        return tuple(symbols)
+
+    def encode(self, text):
+        """Returns the token ids for text."""
+        ids = []
+        for piece in pretokenize(text):
+            ids.extend(self._encode_piece(piece))
+        return ids
+
+    def decode(self, ids):
+        return b"".join(self._vocab[i] for i in ids).decode("utf-8", errors="replace")
+
+    def count_tokens(self, text):
+        return sum(len(self._encode_piece(piece)) for piece in pretokenize(text))
+
+    def cache_info(self):
+        return self._encode_piece.cache_info()
+
+    def encode_batch(self, texts, workers=None, chunksize=64):
+        """Encodes many texts; workers=1 runs in-process, otherwise in a process pool."""
+        if workers == 1:
+            return [self.encode(text) for text in texts]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.left, self.right, self.cache_size)) as pool:
+            return list(pool.map(_encode_in_worker, texts, chunksize=chunksize))
+
+    # 3. Persistence
+    def save(self, path):
+        np.savez(path, left=self.left, right=self.right)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        data = np.load(path)
+        return cls(data["left"], data["right"], **kwargs)
+
+    def __getstate__(self):
+        return {"left": self.left, "right": self.right, "cache_size": self.cache_size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build()
+
+
+def _init_worker(left, right, cache_size):
+    global _WORKER_TOKENIZER
+    _WORKER_TOKENIZER = BPETokenizer(left, right, cache_size)
+
+
+def _encode_in_worker(text):
+    return _WORKER_TOKENIZER.encode(text)
+
+
+def estimate_cost(tokenizer, texts, price_per_1k_tokens):
+    """Returns (total tokens, estimated cost) for a list of prompts."""
+    tokens = sum(tokenizer.count_tokens(text) for text in texts)
+    return tokens, tokens / 1000 * price_per_1k_tokens
+
+
+def benchmark(tokenizer, texts, workers=(1, None)):
+    """Prints encoding throughput in tokens per second."""
+    for n_workers in workers:
+        tokenizer._encode_piece.cache_clear()
+        start = time.perf_counter()
+        encoded = tokenizer.encode_batch(texts, workers=n_workers)
+        elapsed = time.perf_counter() - start
+        n_tokens = sum(len(ids) for ids in encoded)
+        print(f"workers={n_workers}: {n_tokens:,} tokens in {elapsed:.3f} s "
+              f"({n_tokens / elapsed:,.0f} tokens/s)")
+        if n_workers == 1:
+            print("  piece cache:", tokenizer.cache_info())
+
+
+if __name__ == "__main__":
+    import json
+    import os
+
+    # Train on the LLM+RAG notebook itself
+    notebook = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "LLM+RAG_interview_questions.ipynb")
+    with open(notebook) as f:
+        cells = json.load(f)["cells"]
+    corpus = ["".join(cell["source"]) for cell in cells]
+
+    start = time.perf_counter()
+    tok = BPETokenizer.train(corpus, vocab_size=1000)
+    print(f"Trained {tok.vocab_size} tokens in {time.perf_counter() - start:.2f} s")
+
+    text = "What is tokenization, and how does it affect generation?"
+    ids = tok.encode(text)
+    print(f"{len(text)} characters -> {len(ids)} tokens:", [tok.decode([i]) for i in ids])
+    print("Round trip exact:", tok.decode(ids) == text)
+
+    tokens, cost = estimate_cost(tok, corpus, price_per_1k_tokens=0.01)
+    print(f"Notebook: {tokens:,} tokens, estimated cost ${cost:.4f} at $0.01 / 1k tokens")
+
+    benchmark(tok, corpus * 200)
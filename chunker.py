@@ -0,0 +1,363 @@
+"""
+# Chunker — Streaming Document Chunking for RAG
+
+The LLM+RAG notes list three chunking strategies: structure-first (split on
+headings and paragraphs), length-bounded (500–800 tokens) and overlapping
+chunks that keep context across boundaries. This module implements them as
+a streaming pipeline:
+
+- **Blocks**: a binary file is read line by line and grouped into headings
+  (markdown `#` lines) and paragraphs (runs of non-blank lines). Lines are
+  read at most `max_block_bytes` at a time, and a paragraph that grows past
+  that size is emitted in parts, so memory stays bounded even for input
+  without blank lines.
+- **Units**: in `structure` mode a paragraph is one unit. A paragraph over
+  the token budget is split into sentences, and an over-long sentence into
+  BPE pre-token pieces. In `length` mode every unit is a piece and headings
+  do not force breaks.
+- **Packing**: units are packed into chunks of at most `max_tokens`, each
+  unit counted together with the whitespace that follows it. The joined
+  chunk text is recounted before it is emitted; if it is still over budget
+  (token boundaries can shift where units meet), its last units move on to
+  the next chunk. After a chunk is emitted, its trailing units (up to
+  `overlap` tokens) start the next chunk. In `structure` mode a heading
+  always starts a new chunk, without overlap.
+- Each chunk carries **byte offsets** into the source file, so
+  `source[start:end]` is exactly the chunk text.
+
+Token counts come from a `bpe_tokenizer.BPETokenizer` (or anything with a
+`count_tokens` method). Without a tokenizer the number of pre-token pieces
+(roughly words) is used.
+
+---
+"""
+
+import io
+import re
+import time
+from collections import deque
+
+import numpy as np
+
+from bpe_tokenizer import pretokenize
+
+MODES = ("structure", "length")
+HEADING_PATTERN = re.compile(rb"(#{1,6})[ \t]+(.*?)\s*$")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Marks a forced chunk boundary in the unit stream (a heading in structure mode)
+_BREAK = None
+# Marks the end of the unit stream while packing
+_END = object()
+
+
+def _decode(raw):
+    return raw.decode("utf-8", "surrogateescape")
+
+
+def _encode(text):
+    return text.encode("utf-8", "surrogateescape")
+
+
+def _count_pieces(text):
+    return len(pretokenize(text))
+
+
+def _one(piece):
+    return 1
+
+
+# 1. Blocks: headings and paragraphs with byte offsets
+def _split_block(block):
+    kind, start, raw = block
+    raw = bytes(raw)
+    content = raw.rstrip()
+    return kind, start, content, raw[len(content):]
+
+
+def iter_blocks(f, max_block_bytes=1 << 20):
+    """Yields (kind, start, content, trailing) per heading or paragraph of a binary file.
+
+    kind is 'heading' or 'paragraph', start is the byte offset of content, and
+    trailing holds the whitespace up to the next block. Paragraphs longer than
+    max_block_bytes are yielded in parts, split at line boundaries or inside
+    lines that are themselves longer.
+    """
+    pending = None  # [kind, start, bytearray]
+    in_paragraph = False
+    at_line_start = True
+    offset = 0
+    while True:
+        line = f.readline(max_block_bytes)
+        if not line:
+            break
+        if at_line_start and not line.strip():
+            if pending is not None:
+                pending[2] += line
+            in_paragraph = False
+        else:
+            heading = at_line_start and HEADING_PATTERN.match(line) is not None
+            full = pending is not None and len(pending[2]) >= max_block_bytes
+            if heading or not in_paragraph or full:
+                if pending is not None:
+                    yield _split_block(pending)
+                pending = ["heading" if heading else "paragraph", offset, bytearray(line)]
+                in_paragraph = not heading
+            else:
+                pending[2] += line
+        offset += len(line)
+        at_line_start = line.endswith(b"\n")
+    if pending is not None:
+        yield _split_block(pending)
+
+
+# 2. Units: the pieces chunks are packed from
+def _split(text, start, trailing, pattern):
+    """Splits text on separator matches into (start, content, trailing) byte triples."""
+    pos = 0
+    for m in pattern.finditer(text):
+        content, gap = _encode(text[pos:m.start()]), _encode(m.group())
+        yield start, content, gap
+        start += len(content) + len(gap)
+        pos = m.end()
+    yield start, _encode(text[pos:]), trailing
+
+
+def _pieces(text, start, trailing):
+    pieces = pretokenize(text)
+    for i, piece in enumerate(pieces):
+        raw = _encode(piece)
+        yield start, raw, trailing if i == len(pieces) - 1 else b""
+        start += len(raw)
+
+
+def _iter_units(blocks, count, count_piece, max_tokens, mode):
+    """Yields (start, content, trailing, tokens, section, joined) units and _BREAK markers.
+
+    tokens counts the content alone (a chunk's last unit) and joined the
+    content followed by its trailing whitespace (any other unit).
+    """
+    section = None
+    # Whitespace is counted as it tokenizes in front of the next word, e.g. " " joins " word"
+    probe = count("a")
+    gaps = {}  # trailing whitespace -> tokens; the same few gaps ("\n\n", " ") repeat
+
+    def unit(start, content, trailing, tokens):
+        if trailing:
+            gap = gaps.get(trailing)
+            if gap is None:
+                gap = count(_decode(trailing) + "a") - probe
+                if len(trailing) <= 16:
+                    gaps[trailing] = gap
+            joined = tokens + gap
+        else:
+            joined = tokens
+        return start, content, trailing, tokens, section, joined
+
+    for kind, start, content, trailing in blocks:
+        text = _decode(content)
+        if kind == "heading":
+            section = _decode(HEADING_PATTERN.match(content).group(2))
+            if mode == "structure":
+                yield _BREAK
+        if mode == "length":
+            for p_start, p_content, p_trailing in _pieces(text, start, trailing):
+                yield unit(p_start, p_content, p_trailing, count_piece(_decode(p_content)))
+            continue
+
+        tokens = count(text)
+        if tokens <= max_tokens:
+            yield unit(start, content, trailing, tokens)
+            continue
+        for s_start, s_content, s_trailing in _split(text, start, trailing, SENTENCE_END):
+            sentence = _decode(s_content)
+            tokens = count(sentence)
+            if tokens <= max_tokens:
+                yield unit(s_start, s_content, s_trailing, tokens)
+                continue
+            for p_start, p_content, p_trailing in _pieces(sentence, s_start, s_trailing):
+                yield unit(p_start, p_content, p_trailing, count_piece(_decode(p_content)))
+
+
+# 3. Packing units into overlapping chunks
+def _make_chunk(window, fresh, count, max_tokens, source):
+    """Chunk of the window, recounted exactly; returns (chunk, units dropped from its end).
+
+    While the text is over budget, units after the first fresh one (not
+    overlap from the previous chunk) are dropped from the end, then overlap
+    units from the front.
+    """
+    dropped = []
+    while True:
+        parts = [unit[1] + unit[2] for unit in window]
+        parts[-1] = window[-1][1]
+        text = _decode(b"".join(parts))
+        tokens = count(text)
+        if tokens <= max_tokens or len(window) == 1:
+            break
+        if fresh > 1:
+            dropped.append(window.pop())
+            fresh -= 1
+        else:
+            window.popleft()
+    first, last = window[0], window[-1]
+    chunk = {
+        "source": source,
+        "start": first[0],
+        "end": last[0] + len(last[1]),
+        "tokens": tokens,
+        "section": first[4],
+        "text": text,
+    }
+    return chunk, dropped
+
+
+def _pack(units, max_tokens, overlap, count, source):
+    units = iter(units)
+    pushed_back = deque()  # units to pack again (and the unit that closed the last chunk)
+    window = deque()
+    total = 0  # joined tokens of the window's units
+    fresh = 0  # units in the window that are not overlap from the previous chunk
+    while True:
+        unit = pushed_back.popleft() if pushed_back else next(units, _END)
+        if unit is not _BREAK and unit is not _END:
+            if not window or total + unit[3] <= max_tokens:
+                window.append(unit)
+                total += unit[5]
+                fresh += 1
+                continue
+        if window:
+            size = len(window)
+            chunk, dropped = _make_chunk(window, fresh, count, max_tokens, source)
+            yield chunk
+            pushed_back.extendleft([unit] + dropped)
+            nxt = pushed_back[0]
+            if nxt is _BREAK or nxt is _END:
+                window.clear()
+            if len(window) != size:
+                total = sum(u[5] for u in window)
+            # Keep the tail of the chunk as overlap, as long as the next unit still fits
+            while window and (total > overlap or total + nxt[3] > max_tokens):
+                total -= window.popleft()[5]
+            fresh = 0
+        elif unit is _END:
+            return
+
+
+# 4. Public API
+def chunk_stream(f, max_tokens=600, overlap=80, mode="structure", tokenizer=None, source=None):
+    """Yields chunk dicts (source, start, end, tokens, section, text) from a binary file object."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', use one of {MODES}")
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("overlap must be in [0, max_tokens)")
+    if tokenizer is not None:
+        count = count_piece = tokenizer.count_tokens
+    else:
+        count, count_piece = _count_pieces, _one
+    # A paragraph of 16 bytes per token is far over budget and is split into sentences anyway
+    blocks = iter_blocks(f, max_block_bytes=max(16 * max_tokens, 4096))
+    units = _iter_units(blocks, count, count_piece, max_tokens, mode)
+    return _pack(units, max_tokens, overlap, count, source)
+
+
+def chunk_file(path, **kwargs):
+    """Streams the chunks of one file; offsets index into its bytes."""
+    with open(path, "rb") as f:
+        yield from chunk_stream(f, source=path, **kwargs)
+
+
+def chunk_corpus(paths, **kwargs):
+    """Streams the chunks of many files, one file at a time."""
+    for path in paths:
+        yield from chunk_file(path, **kwargs)
+
+
+def chunk_text(text, **kwargs):
+    """Chunks an in-memory string; offsets index into its UTF-8 bytes."""
+    return chunk_stream(io.BytesIO(_encode(text)), **kwargs)
+
+
+# 5. Throughput benchmark
+def write_synthetic_corpus(path, size_bytes, words, seed=0, block_bytes=1 << 20):
+    """Writes a markdown corpus of about size_bytes made of random sentences over words."""
+    rng = np.random.default_rng(seed)
+    words = np.asarray(words, dtype=object)
+    written = 0
+    section = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            parts = []
+            size = 0
+            while size < block_bytes:
+                section += 1
+                parts.append(f"## Section {section}\n\n")
+                for _ in range(rng.integers(2, 8)):
+                    lengths = rng.integers(6, 30, size=rng.integers(2, 12))
+                    sentences = [" ".join(words[rng.integers(0, len(words), n)]).capitalize() + "."
+                                 for n in lengths]
+                    parts.append(" ".join(sentences) + "\n\n")
+                size = sum(len(p) for p in parts)
+            f.write("".join(parts))
+            written += size
+    return written
+
+
+def benchmark(path, modes=MODES, **kwargs):
+    """Prints MB/s and chunk statistics for a full pass over path in each mode."""
+    with open(path, "rb") as f:
+        f.seek(0, io.SEEK_END)
+        size_mb = f.tell() / 1e6
+    for mode in modes:
+        n_chunks = 0
+        n_tokens = 0
+        start = time.perf_counter()
+        for chunk in chunk_file(path, mode=mode, **kwargs):
+            n_chunks += 1
+            n_tokens += chunk["tokens"]
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>9}: {size_mb:,.0f} MB in {elapsed:.1f} s ({size_mb / elapsed:.1f} MB/s), "
+              f"{n_chunks:,} chunks, {n_tokens / max(n_chunks, 1):.0f} tokens/chunk")
+
+
+if __name__ == "__main__":
+    import json
+    import os
+    import sys
+    import tempfile
+
+    from bpe_tokenizer import BPETokenizer
+
+    # The markdown cells of the LLM+RAG notebook as one document
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "LLM+RAG_interview_questions.ipynb")) as f:
+        cells = json.load(f)["cells"]
+    document = "\n\n".join("".join(c["source"]) for c in cells if c["cell_type"] == "markdown")
+    tok = BPETokenizer.train([document], vocab_size=1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        doc_path = os.path.join(tmp, "notes.md")
+        with open(doc_path, "w", encoding="utf-8") as f:
+            f.write(document)
+        with open(doc_path, "rb") as f:
+            source = f.read()
+
+        for mode in MODES:
+            chunks = list(chunk_file(doc_path, max_tokens=200, overlap=40, mode=mode, tokenizer=tok))
+            exact = all(source[c["start"]:c["end"]] == _encode(c["text"]) for c in chunks)
+            print(f"{mode}: {len(chunks)} chunks, offsets exact: {exact}, "
+                  f"max tokens: {max(c['tokens'] for c in chunks)}")
+        first = next(c for c in chunk_file(doc_path, max_tokens=200, overlap=40, tokenizer=tok)
+                     if c["tokens"] > 50)
+        print(f"Example chunk [{first['start']}:{first['end']}] in section "
+              f"{first['section']!r}: {first['text'][:80]!r}...")
+
+        # Throughput on a synthetic corpus (size in MB from the command line; multi-GB works)
+        size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+        corpus_path = os.path.join(tmp, "corpus.md")
+        written = write_synthetic_corpus(corpus_path, size_mb * 10 ** 6, document.split())
+        print(f"Synthetic corpus: {written / 1e6:,.0f} MB")
+        print("Token counts from pre-token pieces:")
+        benchmark(corpus_path, max_tokens=600, overlap=80)
+        print("Token counts from the BPE tokenizer:")
+        benchmark(corpus_path, modes=("structure",), max_tokens=600, overlap=80, tokenizer=tok)
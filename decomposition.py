@@ -0,0 +1,166 @@
+"""
+# Decomposition — Randomized and Incremental PCA
+
+Day 9 Q16 links eigenvectors to dimensionality reduction, but the only tool
+at hand is the full `np.linalg` decomposition, which is O(n³) and needs the
+whole matrix in memory. This module provides two cheaper routes to the top-k
+principal components:
+
+- **RandomizedPCA**: centers the data and runs the randomized truncated SVD
+  from `sparse_ops`. That costs O(m·n·k) instead of O(m·n·min(m, n)).
+- **IncrementalPCA**: updates the components from streaming row batches
+  (Ross et al., 2008). Each update takes an SVD of the current
+  `k × d` components stacked with one batch, so a 10M × 2,000 matrix can be
+  processed batch by batch from disk.
+
+Both report `explained_variance_` and `explained_variance_ratio_`, and both
+can **warm-start** from a previous fit: the randomized range finder starts
+from the old components, and `IncrementalPCA.partial_fit` simply continues.
+
+---
+"""
+
+import time
+
+import numpy as np
+
+from sparse_ops import randomized_svd
+
+
+def _flip_signs(components):
+    """Makes the largest-magnitude entry of each component positive (deterministic output)."""
+    idx = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(len(components)), idx])
+    signs[signs == 0] = 1
+    return components * signs[:, np.newaxis], signs
+
+
+# 1. Randomized PCA
+class RandomizedPCA:
+    """Top-k PCA via randomized SVD of the centered data."""
+
+    def __init__(self, n_components, oversample=10, n_iter=4, seed=0):
+        self.n_components = n_components
+        self.oversample = oversample
+        self.n_iter = n_iter
+        self.seed = seed
+        self.components_ = None
+
+    def fit(self, X, warm_start=False):
+        X = np.asarray(X, dtype=np.float64)
+        self.mean_ = X.mean(axis=0)
+        Xc = X - self.mean_
+        init = None
+        n_iter = self.n_iter
+        if warm_start and self.components_ is not None:
+            init = self.components_.T
+            n_iter = max(1, self.n_iter // 2)
+        _, s, Vt = randomized_svd(Xc, self.n_components, self.oversample, n_iter,
+                                  self.seed, init=init)
+        self.components_, _ = _flip_signs(Vt)
+        n = len(X)
+        self.explained_variance_ = s ** 2 / (n - 1)
+        self.explained_variance_ratio_ = s ** 2 / np.sum(Xc * Xc)
+        return self
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) @ self.components_.T
+
+    def inverse_transform(self, Z):
+        return Z @ self.components_ + self.mean_
+
+
+# 2. Incremental PCA
+class IncrementalPCA:
+    """PCA updated from row batches; memory is O(k·d + batch·d)."""
+
+    def __init__(self, n_components):
+        self.n_components = n_components
+        self.n_samples_seen_ = 0
+        self.components_ = None
+        self.singular_values_ = None
+        self.mean_ = None
+        self._m2 = None  # per-feature sum of squared deviations
+
+    def partial_fit(self, batch):
+        """Folds one batch of rows into the components."""
+        batch = np.asarray(batch, dtype=np.float64)
+        n_b = len(batch)
+        if n_b == 0:
+            return self
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+
+        if self.n_samples_seen_ == 0:
+            stacked = batch - batch_mean
+            self.mean_ = batch_mean
+            self._m2 = batch_m2
+        else:
+            n_old = self.n_samples_seen_
+            total = n_old + n_b
+            delta = batch_mean - self.mean_
+            # Rank-one correction accounts for the shift between old and batch means
+            correction = np.sqrt(n_old * n_b / total) * (self.mean_ - batch_mean)
+            stacked = np.vstack([self.singular_values_[:, np.newaxis] * self.components_,
+                                 batch - batch_mean, correction])
+            self.mean_ = self.mean_ + delta * n_b / total
+            self._m2 = self._m2 + batch_m2 + delta ** 2 * n_old * n_b / total
+
+        self.n_samples_seen_ += n_b
+        _, s, Vt = np.linalg.svd(stacked, full_matrices=False)
+        k = min(self.n_components, len(s))
+        components, _ = _flip_signs(Vt[:k])
+        self.components_ = components
+        self.singular_values_ = s[:k]
+        return self
+
+    def fit(self, batches, warm_start=False):
+        """Fits from an iterable of row batches; warm_start continues the previous fit."""
+        if not warm_start:
+            self.__init__(self.n_components)
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    @property
+    def explained_variance_(self):
+        return self.singular_values_ ** 2 / (self.n_samples_seen_ - 1)
+
+    @property
+    def explained_variance_ratio_(self):
+        return self.singular_values_ ** 2 / self._m2.sum()
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) @ self.components_.T
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    # Low-rank structure plus noise: 5 strong directions in 300 features
+    n, d, k = 50000, 300, 5
+    X = (rng.standard_normal((n, k)) * [10, 8, 6, 4, 2]) @ rng.standard_normal((k, d))
+    X += rng.standard_normal((n, d))
+
+    start = time.perf_counter()
+    U, s_full, Vt_full = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)
+    print("Full SVD:", round(time.perf_counter() - start, 3), "s")
+    exact_ratio = s_full[:k] ** 2 / np.sum(s_full ** 2)
+
+    start = time.perf_counter()
+    rpca = RandomizedPCA(k).fit(X)
+    print("Randomized PCA:", round(time.perf_counter() - start, 3), "s")
+
+    start = time.perf_counter()
+    ipca = IncrementalPCA(k).fit(np.array_split(X, 50))
+    print("Incremental PCA (50 batches):", round(time.perf_counter() - start, 3), "s")
+
+    print("Explained variance ratio (exact):      ", np.round(exact_ratio, 4))
+    print("Explained variance ratio (randomized): ", np.round(rpca.explained_variance_ratio_, 4))
+    print("Explained variance ratio (incremental):", np.round(ipca.explained_variance_ratio_, 4))
+    cos = np.abs(np.sum(ipca.components_ * Vt_full[:k], axis=1))
+    print("|cos| between incremental and exact components:", np.round(cos, 4))
+
+    # Warm start: refit on slightly shifted data from the previous components
+    start = time.perf_counter()
+    rpca.fit(X + rng.normal(0, 0.1, X.shape), warm_start=True)
+    print("Warm-started randomized refit:", round(time.perf_counter() - start, 3), "s")
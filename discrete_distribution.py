@@ -0,0 +1,234 @@
+"""
+# Discrete Distribution — Exact Probability Algebra on NumPy Arrays
+
+Day 10 derives P(sum=7 | one die=3) by listing pairs by hand and computes an
+expected value with `np.sum(values * probabilities)`. Enumeration grows
+exponentially with the number of variables and simulation is only
+approximate. Here distributions are plain arrays:
+
+- `DiscreteDistribution` is an **integer-valued** distribution stored as
+  `pmf[i] = P(X = offset + i)`.
+- **Sums of independent variables** are convolutions of pmf arrays. Small
+  supports use `np.convolve`; large ones use FFT convolution
+  (`scipy.signal.fftconvolve`). `n_fold(n)` uses repeated squaring, so the
+  exact distribution of the sum of 1,000 dice takes milliseconds.
+- **Conditioning** masks the pmf with a vectorized predicate and
+  renormalizes; expectation, variance and the cdf are dot products.
+- `JointDistribution` holds an n-dimensional pmf for several variables. It
+  supports conditioning on predicates over all coordinates, marginalizing
+  axes and collapsing to the distribution of the coordinate sum.
+
+---
+"""
+
+import time
+
+import numpy as np
+from scipy.signal import fftconvolve
+
+# Use FFT convolution once both supports are at least this long
+FFT_MIN_SIZE = 64
+
+
+def _convolve(a, b):
+    if min(len(a), len(b)) >= FFT_MIN_SIZE:
+        out = fftconvolve(a, b)
+        np.maximum(out, 0, out=out)  # FFT round-off can dip slightly below zero
+        return out / out.sum()
+    return np.convolve(a, b)
+
+
+# 1. One-dimensional distributions
+class DiscreteDistribution:
+    """Distribution of an integer random variable: pmf[i] = P(X = offset + i)."""
+
+    def __init__(self, pmf, offset=0, tol=1e-9):
+        pmf = np.asarray(pmf, dtype=np.float64)
+        if pmf.ndim != 1 or len(pmf) == 0:
+            raise ValueError("pmf must be a non-empty 1D array")
+        if (pmf < 0).any():
+            raise ValueError("Probabilities must be non-negative")
+        total = pmf.sum()
+        if abs(total - 1) > tol:
+            raise ValueError(f"Probabilities must sum to 1, got {total}")
+        # Trim zero tails so supports stay as short as possible
+        nz = np.flatnonzero(pmf)
+        self.pmf = pmf[nz[0]:nz[-1] + 1] / total
+        self.offset = int(offset) + int(nz[0])
+
+    # Constructors
+    @classmethod
+    def from_values(cls, values, probabilities):
+        """Builds a distribution from integer values and their probabilities."""
+        values = np.asarray(values)
+        if not np.issubdtype(values.dtype, np.integer):
+            if not np.all(values == np.round(values)):
+                raise ValueError("Only integer-valued supports are supported")
+            values = values.astype(np.int64)
+        low = values.min()
+        pmf = np.zeros(values.max() - low + 1)
+        np.add.at(pmf, values - low, probabilities)
+        return cls(pmf, offset=low)
+
+    @classmethod
+    def uniform(cls, low, high):
+        """Uniform on the integers low..high inclusive (a fair die is uniform(1, 6))."""
+        return cls(np.full(high - low + 1, 1.0 / (high - low + 1)), offset=low)
+
+    @classmethod
+    def bernoulli(cls, p):
+        return cls([1 - p, p])
+
+    @classmethod
+    def binomial(cls, n, p):
+        return cls.bernoulli(p).n_fold(n)
+
+    # Properties
+    @property
+    def support(self):
+        return np.arange(self.offset, self.offset + len(self.pmf))
+
+    def prob(self, k):
+        """P(X = k), vectorized over k."""
+        idx = np.asarray(k) - self.offset
+        inside = (idx >= 0) & (idx < len(self.pmf))
+        return np.where(inside, self.pmf[np.clip(idx, 0, len(self.pmf) - 1)], 0.0)
+
+    def cdf(self, k):
+        """P(X <= k), vectorized over k."""
+        cum = np.cumsum(self.pmf)
+        idx = np.floor(np.asarray(k)).astype(np.int64) - self.offset
+        return np.where(idx < 0, 0.0, cum[np.clip(idx, 0, len(cum) - 1)])
+
+    def expect(self, f=None):
+        """E[f(X)]; E[X] when f is None."""
+        values = self.support if f is None else f(self.support)
+        return float(self.pmf @ values)
+
+    def mean(self):
+        return self.expect()
+
+    def var(self):
+        centered = self.support - self.mean()
+        return float(self.pmf @ (centered * centered))
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def probability(self, predicate):
+        """P(predicate(X)) for a vectorized predicate over the support."""
+        return float(self.pmf[predicate(self.support)].sum())
+
+    # Algebra
+    def __add__(self, other):
+        """Distribution of X + Y for independent X and Y (or X + constant)."""
+        if isinstance(other, (int, np.integer)):
+            return DiscreteDistribution(self.pmf, self.offset + other)
+        return DiscreteDistribution(_convolve(self.pmf, other.pmf), self.offset + other.offset)
+
+    __radd__ = __add__
+
+    def n_fold(self, n):
+        """Distribution of the sum of n independent copies (repeated squaring)."""
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        result = None
+        power = self
+        while n:
+            if n & 1:
+                result = power if result is None else result + power
+            n >>= 1
+            if n:
+                power = power + power
+        return result
+
+    def condition(self, predicate):
+        """Distribution of X given predicate(X) is true."""
+        mask = predicate(self.support)
+        mass = self.pmf[mask].sum()
+        if mass == 0:
+            raise ValueError("Conditioning event has probability zero")
+        return DiscreteDistribution(np.where(mask, self.pmf, 0.0) / mass, self.offset)
+
+    def __repr__(self):
+        return f"DiscreteDistribution(support={self.offset}..{self.offset + len(self.pmf) - 1})"
+
+
+# 2. Joint distributions
+class JointDistribution:
+    """Joint pmf of several integer variables as an n-d array with per-axis offsets."""
+
+    def __init__(self, pmf, offsets):
+        self.pmf = np.asarray(pmf, dtype=np.float64)
+        self.offsets = tuple(int(o) for o in offsets)
+        if len(self.offsets) != self.pmf.ndim:
+            raise ValueError("Need one offset per axis")
+
+    @classmethod
+    def independent(cls, *dists):
+        """Joint distribution of independent variables (outer product of pmfs)."""
+        pmf = dists[0].pmf
+        for d in dists[1:]:
+            pmf = np.multiply.outer(pmf, d.pmf)
+        return cls(pmf, [d.offset for d in dists])
+
+    def grids(self):
+        """Value grids for each axis, broadcastable against pmf."""
+        return np.ix_(*[np.arange(o, o + n) for o, n in zip(self.offsets, self.pmf.shape)])
+
+    def probability(self, predicate):
+        """P(predicate(*values)) with predicate vectorized over the value grids."""
+        mask = np.broadcast_to(predicate(*self.grids()), self.pmf.shape)
+        return float(self.pmf[mask].sum())
+
+    def condition(self, predicate):
+        """Joint distribution given predicate(*values) is true."""
+        mask = np.broadcast_to(predicate(*self.grids()), self.pmf.shape)
+        mass = self.pmf[mask].sum()
+        if mass == 0:
+            raise ValueError("Conditioning event has probability zero")
+        return JointDistribution(np.where(mask, self.pmf, 0.0) / mass, self.offsets)
+
+    def marginal(self, axis):
+        """Distribution of one variable, summing out all others."""
+        others = tuple(a for a in range(self.pmf.ndim) if a != axis)
+        return DiscreteDistribution(self.pmf.sum(axis=others), self.offsets[axis])
+
+    def sum(self):
+        """Distribution of the sum of all coordinates."""
+        total = sum(self.grids())
+        idx = np.broadcast_to(total - sum(self.offsets), self.pmf.shape).ravel()
+        pmf = np.bincount(idx, weights=self.pmf.ravel())
+        return DiscreteDistribution(pmf, sum(self.offsets))
+
+
+if __name__ == "__main__":
+    die = DiscreteDistribution.uniform(1, 6)
+
+    # Day 10 Q8: expected value of a discrete random variable
+    X = DiscreteDistribution.from_values([1, 2, 3, 4], [0.1, 0.2, 0.3, 0.4])
+    print("E[X] =", X.mean(), "Var[X] =", X.var())
+
+    # Day 10 Q9: P(sum=7 | one die=3), exactly, without listing pairs
+    two = JointDistribution.independent(die, die)
+    given = two.condition(lambda a, b: (a == 3) | (b == 3))
+    print("P(sum=7 | one die=3) =", given.sum().prob(7), "(2/11 =", 2 / 11, ")")
+
+    # Day 10 Q7: exact two-dice sum distribution instead of 1,000 draws
+    two_sum = die + die
+    print("Two-dice sum pmf:", dict(zip(two_sum.support.tolist(), np.round(two_sum.pmf, 4).tolist())))
+
+    # Sums of many dice: exact, in milliseconds
+    for n in (10, 100, 1000):
+        start = time.perf_counter()
+        total = die.n_fold(n)
+        elapsed = time.perf_counter() - start
+        print(f"Sum of {n} dice: mean={total.mean():.1f} var={total.var():.2f} "
+              f"P(sum >= {int(3.6 * n)})={1 - total.cdf(int(3.6 * n) - 1):.4e} "
+              f"({elapsed * 1000:.2f} ms)")
+
+    # Counts: binomial via convolution matches scipy
+    from scipy import stats
+    b = DiscreteDistribution.binomial(500, 0.3)
+    print("Binomial(500, 0.3) matches scipy:",
+          np.allclose(b.prob(np.arange(501)), stats.binom.pmf(np.arange(501), 500, 0.3)))
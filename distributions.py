@@ -0,0 +1,270 @@
+"""
+# Distributions — Lightweight Vectorized PDF/CDF/PPF Kernels
+
+Day 8 calls `stats.norm.pdf` and `stats.norm.cdf` through scipy's generic
+frozen-distribution machinery, which costs tens of microseconds per call in
+argument checking alone. Scoring code that makes millions of small calls
+pays mostly overhead. This module provides thin, vectorized kernels for the
+four Day 8 distributions:
+
+- **Normal(loc, scale)**, **Uniform(loc, scale)**: closed-form NumPy
+  expressions; the normal CDF/PPF use the `scipy.special` ufuncs `ndtr` and
+  `ndtri` directly (NumPy has no `erf`), skipping the `rv_frozen` layer.
+- **Binomial(n, p)**, **Poisson(mu)**: the PMF and CDF over the whole support
+  are precomputed **once per parameter set** into lookup tables
+  (`functools.lru_cache`). After that, pmf/cdf are array indexing and ppf is
+  `np.searchsorted`.
+
+Parameters follow scipy's conventions (`loc`/`scale`, ppf returns the
+smallest k with cdf(k) ≥ q), so results can be compared one to one.
+
+---
+"""
+
+import time
+from functools import lru_cache
+
+import numpy as np
+from scipy import special
+
+# Supports larger than this are evaluated analytically instead of tabulated
+MAX_TABLE_SIZE = 1000000
+
+
+# 1. Continuous distributions
+class Normal:
+    """Normal distribution with NumPy-vectorized pdf/cdf/ppf."""
+
+    def __init__(self, loc=0.0, scale=1.0):
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        self.loc = loc
+        self.scale = scale
+        self._norm = 1.0 / (scale * np.sqrt(2 * np.pi))
+
+    def pdf(self, x):
+        z = (np.asarray(x, dtype=np.float64) - self.loc) / self.scale
+        return self._norm * np.exp(-0.5 * z * z)
+
+    def logpdf(self, x):
+        z = (np.asarray(x, dtype=np.float64) - self.loc) / self.scale
+        return np.log(self._norm) - 0.5 * z * z
+
+    def cdf(self, x):
+        return special.ndtr((np.asarray(x, dtype=np.float64) - self.loc) / self.scale)
+
+    def sf(self, x):
+        return special.ndtr((self.loc - np.asarray(x, dtype=np.float64)) / self.scale)
+
+    def ppf(self, q):
+        return self.loc + self.scale * special.ndtri(q)
+
+    def interval(self, confidence):
+        """Returns the central interval holding `confidence` probability mass."""
+        half = self.scale * special.ndtri(0.5 + confidence / 2)
+        return self.loc - half, self.loc + half
+
+
+class Uniform:
+    """Uniform distribution on [loc, loc + scale]."""
+
+    def __init__(self, loc=0.0, scale=1.0):
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        self.loc = loc
+        self.scale = scale
+
+    def pdf(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        inside = (x >= self.loc) & (x <= self.loc + self.scale)
+        return np.where(inside, 1.0 / self.scale, 0.0)
+
+    def cdf(self, x):
+        return np.clip((np.asarray(x, dtype=np.float64) - self.loc) / self.scale, 0.0, 1.0)
+
+    def ppf(self, q):
+        q = np.asarray(q, dtype=np.float64)
+        return np.where((q >= 0) & (q <= 1), self.loc + q * self.scale, np.nan)
+
+
+# 2. Discrete distributions with cached lookup tables
+@lru_cache(maxsize=256)
+def _binomial_table(n, p):
+    k = np.arange(n + 1)
+    log_pmf = (special.gammaln(n + 1) - special.gammaln(k + 1) - special.gammaln(n - k + 1)
+               + special.xlogy(k, p) + special.xlog1py(n - k, -p))
+    return np.exp(log_pmf), special.bdtr(k, n, p)
+
+
+@lru_cache(maxsize=256)
+def _poisson_table(mu):
+    # Tabulate until the upper tail is below double precision
+    upper = int(mu + 40 * np.sqrt(mu) + 40)
+    k = np.arange(upper + 1)
+    pmf = np.exp(special.xlogy(k, mu) - mu - special.gammaln(k + 1))
+    return pmf, special.pdtr(k, mu)
+
+
+class _Discrete:
+    """Shared table lookups for discrete distributions on 0..len(table)-1."""
+
+    def _lookup(self, table, x, below, above):
+        x = np.asarray(x, dtype=np.float64)
+        k = np.floor(x)
+        idx = np.clip(k, 0, len(table) - 1).astype(np.int64)
+        out = table[idx]
+        out = np.where(k < 0, below, out)
+        return np.where(k >= len(table), above, out)
+
+    def pmf(self, x):
+        if isinstance(x, (int, np.integer)) and self._pmf is not None:
+            # Scalar fast path: a plain table index
+            return self._pmf[x] if 0 <= x < len(self._pmf) else 0.0
+        if self._pmf is None:
+            return self._pmf_exact(np.asarray(x, dtype=np.float64))
+        x = np.asarray(x, dtype=np.float64)
+        out = self._lookup(self._pmf, x, 0.0, 0.0)
+        return np.where(x == np.floor(x), out, 0.0)
+
+    def cdf(self, x):
+        if isinstance(x, (int, np.integer)) and self._cdf is not None:
+            return 0.0 if x < 0 else (self._cdf[x] if x < len(self._cdf) else 1.0)
+        if self._cdf is None:
+            return self._cdf_exact(np.floor(np.asarray(x, dtype=np.float64)))
+        return self._lookup(self._cdf, x, 0.0, 1.0)
+
+    def ppf(self, q):
+        """Smallest k with cdf(k) >= q."""
+        q = np.asarray(q, dtype=np.float64)
+        if self._cdf is None:
+            raise ValueError("ppf needs a lookup table; support exceeds MAX_TABLE_SIZE")
+        k = np.searchsorted(self._cdf, q, side="left").astype(np.float64)
+        k = np.where(q == 1, self._upper, np.minimum(k, len(self._cdf) - 1))
+        return np.where((q >= 0) & (q <= 1), np.where(q == 0, -1.0, k), np.nan)
+
+
+class Binomial(_Discrete):
+    """Binomial(n, p) with a cached pmf/cdf table per (n, p)."""
+
+    def __init__(self, n, p):
+        if n < 0 or not 0 <= p <= 1:
+            raise ValueError("need n >= 0 and 0 <= p <= 1")
+        self.n = int(n)
+        self.p = float(p)
+        self._upper = self.n
+        if self.n + 1 <= MAX_TABLE_SIZE:
+            self._pmf, self._cdf = _binomial_table(self.n, self.p)
+        else:
+            self._pmf = self._cdf = None
+
+    def _pmf_exact(self, k):
+        valid = (k == np.floor(k)) & (k >= 0) & (k <= self.n)
+        k = np.clip(k, 0, self.n)
+        log_pmf = (special.gammaln(self.n + 1) - special.gammaln(k + 1)
+                   - special.gammaln(self.n - k + 1)
+                   + special.xlogy(k, self.p) + special.xlog1py(self.n - k, -self.p))
+        return np.where(valid, np.exp(log_pmf), 0.0)
+
+    def _cdf_exact(self, k):
+        return np.where(k < 0, 0.0, special.bdtr(np.clip(k, 0, self.n), self.n, self.p))
+
+    def mean(self):
+        return self.n * self.p
+
+    def var(self):
+        return self.n * self.p * (1 - self.p)
+
+
+class Poisson(_Discrete):
+    """Poisson(mu) with a cached pmf/cdf table per mu."""
+
+    def __init__(self, mu):
+        if mu <= 0:
+            raise ValueError("mu must be positive")
+        self.mu = float(mu)
+        self._upper = np.inf
+        if mu + 40 * np.sqrt(mu) + 41 <= MAX_TABLE_SIZE:
+            self._pmf, self._cdf = _poisson_table(self.mu)
+        else:
+            self._pmf = self._cdf = None
+
+    def _pmf_exact(self, k):
+        valid = (k == np.floor(k)) & (k >= 0)
+        k = np.maximum(k, 0)
+        return np.where(valid, np.exp(special.xlogy(k, self.mu) - self.mu
+                                      - special.gammaln(k + 1)), 0.0)
+
+    def _cdf_exact(self, k):
+        return np.where(k < 0, 0.0, special.pdtr(np.maximum(k, 0), self.mu))
+
+    def mean(self):
+        return self.mu
+
+    def var(self):
+        return self.mu
+
+
+def clear_tables():
+    """Drops every cached lookup table."""
+    _binomial_table.cache_clear()
+    _poisson_table.cache_clear()
+
+
+# 3. Benchmark against scipy.stats
+def benchmark(calls=100000):
+    """Times repeated small calls and a vectorized grid against scipy.stats."""
+    from scipy import stats
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<38} {elapsed:8.4f} s  ({calls / elapsed:,.0f} calls/s)")
+
+    norm = Normal()
+    print(f"--- {calls:,} scalar calls each ---")
+    timed("scipy stats.norm.cdf(1.96)", lambda: [stats.norm.cdf(1.96) for _ in range(calls)])
+    timed("Normal().cdf(1.96)", lambda: [norm.cdf(1.96) for _ in range(calls)])
+    timed("scipy stats.binom.pmf(3, 10, 0.5)",
+          lambda: [stats.binom.pmf(3, 10, 0.5) for _ in range(calls)])
+    timed("Binomial(10, 0.5).pmf(3)", lambda: [Binomial(10, 0.5).pmf(3) for _ in range(calls)])
+    timed("scipy stats.poisson.cdf(4, 3.0)",
+          lambda: [stats.poisson.cdf(4, 3.0) for _ in range(calls)])
+    timed("Poisson(3.0).cdf(4)", lambda: [Poisson(3.0).cdf(4) for _ in range(calls)])
+
+    x = np.linspace(-4, 4, 200)
+    grid_calls = calls // 10
+    print(f"--- {grid_calls:,} calls on the Day 8 200-point grid ---")
+    start = time.perf_counter()
+    for _ in range(grid_calls):
+        stats.norm.pdf(x, loc=0, scale=1)
+    print(f"{'scipy stats.norm.pdf(x)':<38} {time.perf_counter() - start:8.4f} s")
+    start = time.perf_counter()
+    for _ in range(grid_calls):
+        norm.pdf(x)
+    print(f"{'Normal().pdf(x)':<38} {time.perf_counter() - start:8.4f} s")
+
+
+if __name__ == "__main__":
+    from scipy import stats
+
+    # Day 8 examples
+    norm = Normal()
+    x = np.linspace(-4, 4, 200)
+    print("Max pdf difference vs scipy:", np.max(np.abs(norm.pdf(x) - stats.norm.pdf(x))))
+    prob = norm.cdf(1.96) - norm.cdf(-1.96)
+    print(f"Cumulative probability between -1.96 and 1.96: {prob:.4f}")
+
+    # Discrete tables agree with scipy, including ppf
+    k = np.arange(-2, 14)
+    q = np.linspace(0, 1, 11)
+    print("Binomial matches scipy:",
+          np.allclose(Binomial(10, 0.3).pmf(k), stats.binom.pmf(k, 10, 0.3)),
+          np.allclose(Binomial(10, 0.3).cdf(k), stats.binom.cdf(k, 10, 0.3)),
+          np.array_equal(Binomial(10, 0.3).ppf(q), stats.binom.ppf(q, 10, 0.3)))
+    print("Poisson matches scipy:",
+          np.allclose(Poisson(3.0).pmf(k), stats.poisson.pmf(k, 3.0)),
+          np.allclose(Poisson(3.0).cdf(k), stats.poisson.cdf(k, 3.0)),
+          np.array_equal(Poisson(3.0).ppf(q), stats.poisson.ppf(q, 3.0)))
+
+    benchmark()
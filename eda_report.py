@@ -0,0 +1,296 @@
+"""
+# EDA Report — Headless Batch Figure Rendering
+
+Runs the chart recipes from Day 7, Day 8 and Day 10 without a display and
+writes every figure to disk, so hundreds of plots can be produced per dataset
+in batch jobs.
+
+## How it works
+- Matplotlib is switched to the non-interactive **Agg** backend before
+  `pyplot` is imported, so `plt.show()` is never needed.
+- Aggregates (histogram counts, correlation matrix, boxplot stats per
+  category, dice-sum counts, normal PDF grid) are computed **once** in the
+  parent process and shared by every chart that uses the same column.
+- Figures are rendered in a `ProcessPoolExecutor`; the aggregates are sent to
+  each worker once through the pool initializer rather than with every job.
+- Each figure is saved as PNG and/or SVG and an `index.html` lists them all.
+
+## Recipes
+histogram, scatter, boxplot (by category), heatmap (correlation),
+pairplot, dice_sum (Day 10), normal_pdf (Day 8).
+
+---
+"""
+
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib import cbook
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Aggregates shared by every job in a worker process (set by _init_worker)
+_AGGREGATES = None
+
+# Characters not allowed in figure file names (column names may contain "/" etc.)
+UNSAFE_NAME = re.compile(r"[^\w.-]")
+
+
+# 1. Shared aggregates
+def compute_aggregates(df, category_col=None, bins=10, dice_rolls=1000, seed=0):
+    """Computes every aggregate the chart recipes need, once per column."""
+    numeric = df.select_dtypes(include="number")
+    if category_col is not None:
+        numeric = numeric.drop(columns=category_col, errors="ignore")  # a numeric category
+    # Row-aligned values so paired charts can drop rows where either column is NaN
+    values = numeric.to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+    columns = {col: values[~missing[:, j], j] for j, col in enumerate(numeric.columns)}
+
+    hist = {col: np.histogram(values, bins=bins) for col, values in columns.items()}
+
+    box = {}
+    if category_col is not None:
+        groups = df.groupby(category_col, sort=True)
+        for col in columns:
+            labels = []
+            group_values = []
+            for label, group in groups:
+                labels.append(str(label))
+                group_values.append(group[col].dropna().to_numpy())
+            box[col] = cbook.boxplot_stats(group_values, labels=labels)
+
+    rng = np.random.default_rng(seed)
+    dice_sum = rng.integers(1, 7, size=dice_rolls) + rng.integers(1, 7, size=dice_rolls)
+
+    x = np.linspace(-4, 4, 200)
+
+    return {
+        "columns": columns,
+        "values": values,
+        "missing": missing,
+        "column_index": {col: j for j, col in enumerate(numeric.columns)},
+        "hist": hist,
+        "corr": numeric.corr(),
+        "box": box,
+        "dice_counts": np.bincount(dice_sum, minlength=13)[2:13],
+        "dice_rolls": dice_rolls,
+        "normal_pdf": (x, stats.norm.pdf(x, loc=0, scale=1)),
+    }
+
+
+# 2. Chart recipes (each draws onto a fresh figure from shared aggregates)
+def _draw_hist(ax, counts, edges, color="skyblue"):
+    """Draws pre-binned histogram counts as bars."""
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge",
+           color=color, edgecolor="black")
+
+
+def _paired(agg, x_col, y_col):
+    """x and y values from the rows where neither column is NaN."""
+    i, j = agg["column_index"][x_col], agg["column_index"][y_col]
+    keep = ~(agg["missing"][:, i] | agg["missing"][:, j])
+    return agg["values"][keep, i], agg["values"][keep, j]
+
+
+def plot_histogram(fig, agg, col):
+    ax = fig.add_subplot()
+    counts, edges = agg["hist"][col]
+    _draw_hist(ax, counts, edges)
+    ax.set_title(f"{col} Distribution")
+    ax.set_xlabel(col)
+    ax.set_ylabel("Frequency")
+
+
+def plot_scatter(fig, agg, x_col, y_col):
+    ax = fig.add_subplot()
+    ax.scatter(*_paired(agg, x_col, y_col), color="green", edgecolor="black")
+    ax.set_title(f"{x_col} vs {y_col}")
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+
+
+def plot_boxplot(fig, agg, col, category_col):
+    ax = fig.add_subplot()
+    ax.bxp(agg["box"][col], patch_artist=True)
+    ax.set_title(f"{col} distribution by {category_col}")
+    ax.set_xlabel(category_col)
+    ax.set_ylabel(col)
+
+
+def plot_heatmap(fig, agg):
+    ax = fig.add_subplot()
+    corr = agg["corr"]
+    image = ax.imshow(corr.to_numpy(), cmap="coolwarm", vmin=-1, vmax=1)
+    ax.set_xticks(range(len(corr.columns)), corr.columns, rotation=45, ha="right")
+    ax.set_yticks(range(len(corr.index)), corr.index)
+    if len(corr) <= 20:
+        for i in range(len(corr)):
+            for j in range(len(corr)):
+                ax.text(j, i, f"{corr.iat[i, j]:.2f}", ha="center", va="center")
+    fig.colorbar(image, ax=ax)
+    ax.set_title("Correlation matrix")
+
+
+def plot_pairplot(fig, agg, cols):
+    n = len(cols)
+    axes = fig.subplots(n, n, squeeze=False)
+    for i, row_col in enumerate(cols):
+        for j, col in enumerate(cols):
+            ax = axes[i][j]
+            if i == j:
+                counts, edges = agg["hist"][col]
+                _draw_hist(ax, counts, edges)
+            else:
+                ax.scatter(*_paired(agg, col, row_col), s=10)
+            if i == n - 1:
+                ax.set_xlabel(col)
+            if j == 0:
+                ax.set_ylabel(row_col)
+
+
+def plot_dice_sum(fig, agg):
+    ax = fig.add_subplot()
+    ax.bar(range(2, 13), agg["dice_counts"], width=0.8, edgecolor="black")
+    ax.set_title(f"Sum of Two Dice Rolls ({agg['dice_rolls']} trials)")
+    ax.set_xlabel("Sum")
+    ax.set_ylabel("Frequency")
+    ax.set_xticks(range(2, 13))
+
+
+def plot_normal_pdf(fig, agg):
+    ax = fig.add_subplot()
+    x, pdf = agg["normal_pdf"]
+    ax.plot(x, pdf, label="Normal PDF")
+    ax.set_title("Standard Normal Distribution PDF")
+    ax.set_xlabel("x")
+    ax.set_ylabel("Probability Density")
+    ax.legend()
+    ax.grid(True)
+
+
+RECIPES = {
+    "histogram": plot_histogram,
+    "scatter": plot_scatter,
+    "boxplot": plot_boxplot,
+    "heatmap": plot_heatmap,
+    "pairplot": plot_pairplot,
+    "dice_sum": plot_dice_sum,
+    "normal_pdf": plot_normal_pdf,
+}
+
+
+# 3. Job planning
+def plan_figures(agg, category_col=None, max_pairplot_cols=6):
+    """Returns the list of (name, recipe, args, figsize) jobs for a dataset."""
+    cols = list(agg["columns"])
+    jobs = []
+    for col in cols:
+        jobs.append((f"histogram_{col}", "histogram", (col,), (6, 4)))
+    for i, x_col in enumerate(cols):
+        for y_col in cols[i + 1:]:
+            jobs.append((f"scatter_{x_col}_vs_{y_col}", "scatter", (x_col, y_col), (6, 4)))
+    if category_col is not None:
+        for col in cols:
+            jobs.append((f"boxplot_{col}_by_{category_col}", "boxplot",
+                         (col, category_col), (6, 4)))
+    if len(cols) >= 2:
+        jobs.append(("heatmap_correlation", "heatmap", (), (4 + len(cols) * 0.4,) * 2))
+        pair_cols = tuple(cols[:max_pairplot_cols])
+        jobs.append(("pairplot", "pairplot", (pair_cols,), (2.5 * len(pair_cols),) * 2))
+    jobs.append(("dice_sum", "dice_sum", (), (6, 4)))
+    jobs.append(("normal_pdf", "normal_pdf", (), (6, 4)))
+
+    # Names become file names: keep them inside out_dir, short and unique
+    planned, seen = [], set()
+    for name, recipe, args, figsize in jobs:
+        base = safe = UNSAFE_NAME.sub("_", name)[:150]
+        n = 1
+        while safe in seen:
+            n += 1
+            safe = f"{base}_{n}"
+        seen.add(safe)
+        planned.append((safe, recipe, args, figsize))
+    return planned
+
+
+# 4. Rendering
+def _init_worker(agg):
+    """Stores the shared aggregates once per worker process."""
+    global _AGGREGATES
+    _AGGREGATES = agg
+
+
+def _render_job(job, out_dir, formats):
+    """Renders one figure and saves it in every requested format."""
+    name, recipe, args, figsize = job
+    fig = plt.figure(figsize=figsize)
+    try:
+        RECIPES[recipe](fig, _AGGREGATES, *args)
+        fig.tight_layout()
+        paths = []
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            fig.savefig(path, format=fmt)
+            paths.append(path)
+    finally:
+        plt.close(fig)
+    return name, paths
+
+
+def write_index(results, out_dir, title="EDA Report"):
+    """Writes index.html linking every rendered figure."""
+    lines = [f"<html><head><title>{html.escape(title)}</title></head><body>",
+             f"<h1>{html.escape(title)}</h1>"]
+    for name, paths in results:
+        rel = [os.path.basename(p) for p in paths]
+        links = " | ".join(f'<a href="{html.escape(r)}">{html.escape(r)}</a>' for r in rel)
+        lines.append(f"<h3>{html.escape(name)}</h3>")
+        lines.append(f'<img src="{html.escape(rel[0])}" style="max-width:600px"><br>{links}')
+    lines.append("</body></html>")
+    path = os.path.join(out_dir, "index.html")
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+    return path
+
+
+def render_report(df, out_dir, category_col=None, formats=("png", "svg"),
+                  workers=None, bins=10):
+    """Renders every chart recipe for df into out_dir and returns the index path."""
+    os.makedirs(out_dir, exist_ok=True)
+    agg = compute_aggregates(df, category_col=category_col, bins=bins)
+    jobs = plan_figures(agg, category_col=category_col)
+
+    if workers == 1:
+        _init_worker(agg)
+        results = [_render_job(job, out_dir, formats) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(agg,)) as pool:
+            futures = [pool.submit(_render_job, job, out_dir, formats) for job in jobs]
+            results = [future.result() for future in futures]
+    return write_index(results, out_dir)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Same sample DataFrame as Day 7
+    df = pd.DataFrame({
+        'Age': [25, 30, 35, 40, 22, 27, 33, 38],
+        'Salary': [50000, 60000, 65000, 70000, 48000, 52000, 58000, 69000],
+        'City': ['NY', 'NY', 'LA', 'LA', 'NY', 'SF', 'SF', 'LA']
+    })
+
+    out_dir = tempfile.mkdtemp(prefix="eda_report_")
+    start = time.perf_counter()
+    index = render_report(df, out_dir, category_col="City")
+    print("Report index:", index, "Time:", round(time.perf_counter() - start, 3), "s")
+    print("Files written:", len(os.listdir(out_dir)))
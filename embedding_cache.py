@@ -0,0 +1,248 @@
+"""
+# Embedding Cache — Content-Addressed, Memory-Mapped Vector Store
+
+The LLM+RAG notes recommend caching embeddings. Nightly re-ingestion
+re-embeds mostly unchanged chunks, so every vector is stored once under
+its **content address** and reused:
+
+- **Key** = 16-byte BLAKE2b digest of `model_id + "\\0" + text`. Changing
+  the embedding model changes every key, so stale vectors are never
+  served.
+- **Storage**: three `.npy` files opened with `np.lib.format.open_memmap`:
+  `vectors` (capacity × dim, float16 or float32), `keys` (capacity × 16
+  bytes) and `last_used` (a logical clock per slot, 0 = empty). Reopening
+  only rebuilds a dict from the key file; vectors stay on disk until read.
+- **Batched** `get_batch` / `put_batch` gather and scatter whole row sets.
+  `get_or_embed` embeds only the misses.
+- **Eviction**: capacity is given in entries or derived from a byte budget.
+  When the cache is full, the least recently used slots are overwritten.
+- `HashingEmbedder` is a local stand-in model: signed feature hashing of
+  words and character trigrams, i.e. a sparse random projection of the
+  bag of features. It needs no network and no weights.
+
+---
+"""
+
+import hashlib
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+
+KEY_BYTES = 16
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def cache_key(text, model_id):
+    """16-byte content address of text under an embedding model."""
+    data = model_id.encode("utf-8") + b"\0" + text.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=KEY_BYTES).digest()
+
+
+# 1. Local stand-in embedder
+class HashingEmbedder:
+    """Feature-hashing embedder over words and character trigrams (unit-length rows)."""
+
+    def __init__(self, dim=256, seed=0):
+        self.dim = dim
+        self.seed = seed
+        self.model_id = f"hashing-v1-d{dim}-s{seed}"
+
+    def _features(self, text):
+        words = WORD_PATTERN.findall(text.lower())
+        features = list(words)
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return [zlib.crc32(f.encode("utf-8"), self.seed) for f in features]
+
+    def embed(self, texts):
+        rows, hashes = [], []
+        for i, text in enumerate(texts):
+            h = self._features(text)
+            rows.extend([i] * len(h))
+            hashes.extend(h)
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(out, (np.asarray(rows, dtype=np.int64), (hashes >> 1) % self.dim), signs)
+        lengths = np.sqrt(np.einsum("ij,ij->i", out, out))
+        return out / np.where(lengths > 0, lengths, 1)[:, np.newaxis]
+
+
+# 2. Cache
+class EmbeddingCache:
+    """Persistent LRU cache of embeddings keyed by (text, model id)."""
+
+    def __init__(self, path, dim, dtype=np.float16, capacity=None, max_bytes=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        files = [os.path.join(path, f"{name}.npy") for name in ("vectors", "keys", "last_used")]
+        if all(os.path.exists(f) for f in files):
+            self.vectors, self.keys, self.last_used = (
+                np.lib.format.open_memmap(f, mode="r+") for f in files)
+            if self.vectors.shape[1] != dim or self.vectors.dtype != np.dtype(dtype):
+                raise ValueError(f"Cache at {path} holds {self.vectors.dtype} vectors of "
+                                 f"dim {self.vectors.shape[1]}, not {np.dtype(dtype)} / {dim}")
+        else:
+            if capacity is None:
+                if max_bytes is None:
+                    raise ValueError("Give capacity or max_bytes for a new cache")
+                capacity = max_bytes // (dim * np.dtype(dtype).itemsize + KEY_BYTES + 8)
+            self.vectors = np.lib.format.open_memmap(files[0], mode="w+", dtype=dtype,
+                                                     shape=(capacity, dim))
+            self.keys = np.lib.format.open_memmap(files[1], mode="w+", dtype=np.uint8,
+                                                  shape=(capacity, KEY_BYTES))
+            self.last_used = np.lib.format.open_memmap(files[2], mode="w+", dtype=np.int64,
+                                                       shape=(capacity,))
+        occupied = np.flatnonzero(self.last_used)
+        self._slots = {self.keys[s].tobytes(): int(s) for s in occupied}
+        self._clock = int(self.last_used.max()) if len(occupied) else 0
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def capacity(self):
+        return len(self.vectors)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    # Batched access
+    def get_batch(self, texts, model_id):
+        """Returns (vectors float32 (n, dim), found mask); rows of misses are zero."""
+        slots = np.array([self._slots.get(cache_key(t, model_id), -1) for t in texts],
+                         dtype=np.int64)
+        found = slots >= 0
+        out = np.zeros((len(texts), self.vectors.shape[1]), dtype=np.float32)
+        if found.any():
+            hit_slots = slots[found]
+            out[found] = self.vectors[hit_slots]
+            self.last_used[hit_slots] = self._tick()
+        n_hits = int(found.sum())
+        self.hits += n_hits
+        self.misses += len(texts) - n_hits
+        return out, found
+
+    def _allocate(self, n, protected):
+        """Returns n slots: free ones first, then the least recently used."""
+        free = np.flatnonzero(self.last_used == 0)[:n]
+        if len(free) == n:
+            return free
+        used = self.last_used.copy()
+        used[used == 0] = np.iinfo(np.int64).max
+        used[protected] = np.iinfo(np.int64).max
+        need = n - len(free)
+        victims = np.argpartition(used, need - 1)[:need]
+        for s in victims:
+            del self._slots[self.keys[s].tobytes()]
+        self.evictions += need
+        return np.concatenate([free, victims])
+
+    def put_batch(self, texts, model_id, vectors):
+        """Stores vectors for texts (existing keys are overwritten in place)."""
+        vectors = np.asarray(vectors)
+        keys = [cache_key(t, model_id) for t in texts]
+        unique = {}
+        for i, key in enumerate(keys):
+            unique[key] = i  # last write wins for duplicates within a batch
+        rows = np.fromiter(unique.values(), dtype=np.int64, count=len(unique))
+        keys = list(unique)
+        if len(keys) > self.capacity:
+            keys, rows = keys[-self.capacity:], rows[-self.capacity:]
+
+        slots = np.array([self._slots.get(k, -1) for k in keys], dtype=np.int64)
+        new = slots < 0
+        if new.any():
+            new_keys = [k for k, is_new in zip(keys, new) if is_new]
+            slots[new] = self._allocate(len(new_keys), slots[~new])
+            self._slots.update(zip(new_keys, slots[new].tolist()))
+            self.keys[slots[new]] = np.frombuffer(b"".join(new_keys),
+                                                  dtype=np.uint8).reshape(-1, KEY_BYTES)
+        self.vectors[slots] = vectors[rows]
+        self.last_used[slots] = self._tick()
+
+    def get_or_embed(self, texts, embedder, batch_size=256):
+        """Vectors for texts, computing and storing only the ones not cached yet."""
+        out, found = self.get_batch(texts, embedder.model_id)
+        missing = np.flatnonzero(~found)
+        unique = {}
+        for i in missing:
+            unique.setdefault(texts[i], []).append(i)
+        pending = list(unique)
+        for b0 in range(0, len(pending), batch_size):
+            batch = pending[b0:b0 + batch_size]
+            vectors = embedder.embed(batch)
+            self.put_batch(batch, embedder.model_id, vectors)
+            # Return what the cache stores, so hits and misses are identical across runs
+            stored = vectors.astype(self.vectors.dtype).astype(np.float32)
+            for text, vector in zip(batch, stored):
+                out[unique[text]] = vector
+        return out
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self), "capacity": self.capacity, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self.vectors.nbytes + self.keys.nbytes + self.last_used.nbytes}
+
+    def flush(self):
+        for array in (self.vectors, self.keys, self.last_used):
+            array.flush()
+
+
+if __name__ == "__main__":
+    import json
+    import tempfile
+
+    from chunker import chunk_text
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "LLM+RAG_interview_questions.ipynb")) as f:
+        cells = json.load(f)["cells"]
+    document = "\n\n".join("".join(c["source"]) for c in cells if c["cell_type"] == "markdown")
+    chunks = [c["text"] for c in chunk_text(document, max_tokens=120, overlap=20)]
+    embedder = HashingEmbedder(dim=256)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, dim=256, capacity=10000)
+        for run in ("first ingestion", "re-ingestion"):
+            start = time.perf_counter()
+            vectors = cache.get_or_embed(chunks, embedder)
+            print(f"{run}: {len(chunks)} chunks in {(time.perf_counter() - start) * 1000:.1f} ms,",
+                  cache.stats())
+        cache.flush()
+
+        # Reopening from disk only rebuilds the key dict
+        start = time.perf_counter()
+        reopened = EmbeddingCache(tmp, dim=256)
+        again = reopened.get_or_embed(chunks[:-1] + [chunks[-1] + " (edited)"], embedder)
+        print(f"Reopened in {(time.perf_counter() - start) * 1000:.1f} ms, one edited chunk:",
+              reopened.stats())
+        print("Cached vectors identical:", np.array_equal(again[:-1], vectors[:-1]),
+              "float16 error vs fresh:", float(np.abs(vectors - embedder.embed(chunks)).max()))
+
+        # A different model id never sees these vectors
+        _, found = reopened.get_batch(chunks[:5], HashingEmbedder(dim=256, seed=1).model_id)
+        print("Hits for another model id:", int(found.sum()))
+
+    # Throughput and LRU eviction with a cache smaller than the working set
+    rng = np.random.default_rng(0)
+    words = np.array(document.split())
+    texts = [" ".join(rng.choice(words, 60)) for _ in range(20000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, dim=256, max_bytes=10000 * (256 * 2 + 24))
+        start = time.perf_counter()
+        cache.get_or_embed(texts, embedder, batch_size=1024)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        cache.get_or_embed(texts[-5000:], embedder)
+        warm = time.perf_counter() - start
+        print(f"Cold: {len(texts) / cold:,.0f} texts/s, warm: {5000 / warm:,.0f} texts/s,",
+              cache.stats())
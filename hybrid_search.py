@@ -0,0 +1,336 @@
+"""
+# Hybrid Search — BM25 Inverted Index Fused with Vector Retrieval
+
+Vector search misses exact identifiers (error codes, function names, ids),
+and keyword search misses paraphrases. This module adds the keyword side
+and fuses the two:
+
+- `InvertedIndex` maps every term to its **posting list**: the ids of the
+  chunks that contain it and the term frequency in each. Lists are sorted
+  by chunk id, so the ids are stored as **deltas** (gaps). Gaps and
+  frequencies are **varint** encoded (7 bits per byte, high bit =
+  "more bytes follow") into two flat `uint8` buffers, with per-term
+  offsets. Encoding and decoding are vectorized with NumPy.
+- `save` writes the buffers as `.npy` files, and `load` memory-maps them.
+  A query only touches the bytes of its own terms' posting lists.
+- **BM25** scoring is vectorized per term: the decoded ids index an array
+  of per-chunk length norms, and `scores[ids] += contribution` works
+  without `np.add.at` because ids within one list are unique. The decoded
+  ids and contributions of long (frequent-term) lists are kept in an LRU
+  cache under a byte budget, so hot terms are decoded once.
+- `reciprocal_rank_fusion` merges ranked lists with
+  `score(d) = Σ w / (k + rank(d))`. It needs no score calibration between
+  BM25 and cosine. `HybridRetriever` runs both retrievers and fuses them.
+
+---
+"""
+
+import json
+import os
+import re
+import time
+from array import array
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercased word tokens; identifiers such as user_id or E1234 stay whole."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+# 1. Varint codec
+def varint_encode(values):
+    """Encodes non-negative integers (< 2**35) into bytes; returns (bytes, start of each value)."""
+    v = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(len(v), dtype=np.int64)
+    for shift in (7, 14, 21, 28):
+        nbytes += v >= (1 << shift)
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for j in range(5):
+        m = nbytes > j
+        if not m.any():
+            break
+        byte = (v[m] >> np.uint64(7 * j)) & np.uint64(0x7F)
+        more = (nbytes[m] > j + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[m] + j] = byte | more
+    return out, starts
+
+
+def varint_decode(buf):
+    """Decodes a byte buffer of complete varints into an int64 array."""
+    b = np.asarray(buf, dtype=np.uint8)
+    if len(b) == 0:
+        return np.empty(0, dtype=np.int64)
+    last = b < 0x80
+    if last.all():
+        return b.astype(np.int64)  # every value fits in one byte (typical for dense lists)
+    starts = np.concatenate([[0], np.flatnonzero(last)[:-1] + 1])
+    value_id = np.cumsum(last) - last
+    shift = (np.arange(len(b)) - starts[value_id]) * 7
+    return np.add.reduceat((b & 0x7F).astype(np.int64) << shift, starts)
+
+
+# 2. Inverted index
+class InvertedIndex:
+    """BM25 keyword index with delta + varint compressed posting lists."""
+
+    ARRAYS = ("doc_bytes", "doc_offsets", "tf_bytes", "tf_offsets", "df", "doc_lengths", "ids")
+
+    def __init__(self, k1=1.2, b=0.75, cache_min_df=4096, cache_bytes=256 * 1024 * 1024):
+        self.k1 = k1
+        self.b = b
+        self.vocab = {}
+        self.cache_min_df = cache_min_df
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, texts, ids=None, **kwargs):
+        """Indexes an iterable of texts (e.g. chunker output), streaming through it once."""
+        index = cls(**kwargs)
+        vocab = index.vocab
+        term_ids = array("I")
+        tfs = array("I")
+        lengths = array("I")
+        for text in texts:
+            counts = Counter(tokenize(text))
+            term_ids.extend([vocab.setdefault(t, len(vocab)) for t in counts])
+            tfs.extend(counts.values())
+            lengths.append(len(counts))  # postings in this doc for now; fixed below
+        term_ids = np.frombuffer(term_ids, dtype=np.uint32)
+        tfs = np.frombuffer(tfs, dtype=np.uint32)
+        postings_per_doc = np.frombuffer(lengths, dtype=np.uint32)
+        docs = np.repeat(np.arange(len(postings_per_doc), dtype=np.int64), postings_per_doc)
+
+        # Group postings by term; the stable sort keeps doc ids ascending within each term
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, docs, tfs = term_ids[order], docs[order], tfs[order]
+        df = np.bincount(term_ids, minlength=len(vocab))
+        first = np.cumsum(df) - df
+        gaps = np.diff(docs, prepend=0)
+        gaps[first[df > 0]] = docs[first[df > 0]]
+
+        index.doc_bytes, doc_starts = varint_encode(gaps)
+        index.tf_bytes, tf_starts = varint_encode(tfs)
+        index.doc_offsets = np.append(doc_starts[first], len(index.doc_bytes)).astype(np.int64)
+        index.tf_offsets = np.append(tf_starts[first], len(index.tf_bytes)).astype(np.int64)
+        index.df = df.astype(np.int64)
+        n = len(postings_per_doc)
+        index.doc_lengths = np.bincount(docs, weights=tfs, minlength=n).astype(np.uint32)
+        index.ids = np.arange(n, dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        index._prepare()
+        return index
+
+    def _prepare(self):
+        """Precomputes the BM25 length norm per chunk and the idf per term."""
+        lengths = np.asarray(self.doc_lengths, dtype=np.float32)
+        avg = lengths.mean() if len(lengths) else 1.0
+        self._norm = self.k1 * (1 - self.b + self.b * lengths / max(avg, 1e-9))
+        df = np.asarray(self.df, dtype=np.float64)
+        self._idf = np.log(1 + (len(lengths) - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def _decode(self, t):
+        gaps = varint_decode(self.doc_bytes[self.doc_offsets[t]:self.doc_offsets[t + 1]])
+        tfs = varint_decode(self.tf_bytes[self.tf_offsets[t]:self.tf_offsets[t + 1]])
+        return np.cumsum(gaps), tfs
+
+    def postings(self, term):
+        """(chunk positions, term frequencies) for one term; empty arrays for unknown terms."""
+        t = self.vocab.get(term)
+        if t is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return self._decode(t)
+
+    def _contributions(self, t):
+        """(chunk positions, BM25 contributions) of term id t, cached for long lists."""
+        hit = self._cache.get(t)
+        if hit is not None:
+            self._cache.move_to_end(t)
+            return hit
+        docs, tfs = self._decode(t)
+        contrib = self._idf[t] * tfs * (self.k1 + 1) / (tfs + self._norm[docs])
+        if len(docs) >= self.cache_min_df:
+            entry = (docs.astype(np.int32), contrib.astype(np.float32))
+            self._cache[t] = entry
+            self._cached_bytes += entry[0].nbytes + entry[1].nbytes
+            while self._cached_bytes > self.cache_bytes and self._cache:
+                old_docs, old_contrib = self._cache.popitem(last=False)[1]
+                self._cached_bytes -= old_docs.nbytes + old_contrib.nbytes
+        return docs, contrib
+
+    def search(self, query, k=10):
+        """Returns (ids, BM25 scores) of the top k chunks for a query string."""
+        terms = [self.vocab[t] for t in set(tokenize(query)) if t in self.vocab]
+        if not terms:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = np.zeros(len(self), dtype=np.float32)
+        touched = []
+        for t in terms:
+            docs, contrib = self._contributions(t)
+            scores[docs] += contrib
+            touched.append(docs)
+        if len(touched) == 1:
+            touched = touched[0]
+        elif sum(len(d) for d in touched) * 16 > len(self):
+            touched = np.flatnonzero(scores)  # a scan beats sorting large id sets
+        else:
+            touched = np.unique(np.concatenate(touched))
+        top = touched[np.argpartition(-scores[touched], min(k, len(touched)) - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return np.asarray(self.ids)[top], scores[top]
+
+    def search_batch(self, queries, k=10):
+        """Top-k ids per query as an (n_queries, k) array padded with -1."""
+        out = np.full((len(queries), k), -1, dtype=np.int64)
+        for i, query in enumerate(queries):
+            ids, _ = self.search(query, k)
+            out[i, :len(ids)] = ids
+        return out
+
+    # Persistence
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        terms = sorted(self.vocab, key=self.vocab.get)
+        with open(os.path.join(path, "lexical.json"), "w") as f:
+            json.dump({"k1": self.k1, "b": self.b, "terms": terms}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True, **kwargs):
+        with open(os.path.join(path, "lexical.json")) as f:
+            header = json.load(f)
+        index = cls(header["k1"], header["b"], **kwargs)
+        index.vocab = {t: i for i, t in enumerate(header["terms"])}
+        for name in cls.ARRAYS:
+            setattr(index, name, np.load(os.path.join(path, f"{name}.npy"),
+                                         mmap_mode="r" if mmap else None))
+        index._prepare()
+        return index
+
+    def size_bytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+
+# 3. Fusion
+def reciprocal_rank_fusion(rankings, k=60, weights=None, top_k=10):
+    """Fuses ranked id arrays (best first, -1 = padding); returns (ids, fused scores)."""
+    weights = np.ones(len(rankings)) if weights is None else np.asarray(weights, dtype=np.float64)
+    ids, contrib = [], []
+    for ranking, w in zip(rankings, weights):
+        ranking = np.asarray(ranking, dtype=np.int64)
+        valid = ranking >= 0
+        ids.append(ranking[valid])
+        contrib.append(w / (k + 1 + np.flatnonzero(valid)))
+    ids = np.concatenate(ids)
+    if len(ids) == 0:
+        return ids, np.empty(0)
+    unique, inverse = np.unique(ids, return_inverse=True)
+    fused = np.bincount(inverse, weights=np.concatenate(contrib))
+    order = np.argsort(-fused, kind="stable")[:top_k]
+    return unique[order], fused[order]
+
+
+class HybridRetriever:
+    """Runs BM25 and vector search over the same chunk ids and fuses them with RRF."""
+
+    def __init__(self, lexical, vector_index, embedder, rrf_k=60, weights=(1.0, 1.0)):
+        self.lexical = lexical
+        self.vector_index = vector_index
+        self.embedder = embedder
+        self.rrf_k = rrf_k
+        self.weights = weights
+
+    def search(self, queries, k=10, candidates=50):
+        """Fused top-k ids per query as an (n_queries, k) array padded with -1."""
+        lexical = self.lexical.search_batch(queries, candidates)
+        dense, _ = self.vector_index.search(self.embedder.embed(queries), candidates)
+        out = np.full((len(queries), k), -1, dtype=np.int64)
+        for i in range(len(queries)):
+            ids, _ = reciprocal_rank_fusion([lexical[i], dense[i]], self.rrf_k, self.weights, k)
+            out[i, :len(ids)] = ids
+        return out
+
+
+# 4. Scale benchmark
+def synthetic_chunks(n, words, length=80, seed=0):
+    """n chunks of Zipf-distributed words (realistic document frequencies)."""
+    rng = np.random.default_rng(seed)
+    words = np.asarray(words, dtype=object)[rng.permutation(len(words))]
+    for _ in range(n):
+        picks = np.minimum(rng.zipf(1.3, length), len(words)) - 1
+        yield " ".join(words[picks])
+
+
+def benchmark(n_chunks, words, n_queries=1000, seed=0):
+    start = time.perf_counter()
+    index = InvertedIndex.build(synthetic_chunks(n_chunks, words, seed=seed))
+    build = time.perf_counter() - start
+    raw = 12 * int(index.df.sum())  # int64 id + int32 tf per posting, uncompressed
+    print(f"Indexed {n_chunks:,} chunks in {build:.1f} s ({n_chunks / build:,.0f} chunks/s); "
+          f"postings {index.df.sum():,}, compressed {index.size_bytes() / 1e6:.1f} MB "
+          f"vs {raw / 1e6:.1f} MB raw")
+
+    rng = np.random.default_rng(seed + 1)
+    queries = [" ".join(rng.choice(words, rng.integers(2, 5))) for _ in range(n_queries)]
+    latency = []
+    for query in queries:
+        t0 = time.perf_counter()
+        index.search(query, 10)
+        latency.append(time.perf_counter() - t0)
+    p50, p99 = np.percentile(np.array(latency) * 1000, [50, 99])
+    print(f"BM25 query latency over {n_queries} queries: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    from chunker import chunk_text
+    from embedding_cache import HashingEmbedder
+    from vector_index import FlatIndex
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "LLM+RAG_interview_questions.ipynb")) as f:
+        cells = json.load(f)["cells"]
+    document = "\n\n".join("".join(c["source"]) for c in cells if c["cell_type"] == "markdown")
+    chunks = [c["text"] for c in chunk_text(document, max_tokens=80, overlap=10)]
+
+    values = np.random.default_rng(0).integers(0, 2 ** 35, 100000)
+    encoded, _ = varint_encode(values)
+    print("Varint round trip:", np.array_equal(varint_decode(encoded), values),
+          f"({encoded.nbytes / len(values):.2f} bytes/value)")
+
+    lexical = InvertedIndex.build(chunks)
+    embedder = HashingEmbedder()
+    dense = FlatIndex(embedder.dim).add(embedder.embed(chunks))
+    hybrid = HybridRetriever(lexical, dense, embedder)
+    for query in ["MRR", "how to cut hallucinations", "vector database choice"]:
+        lex_ids, _ = lexical.search(query, 3)
+        vec_ids = dense.search(embedder.embed([query]), 3)[0][0]
+        fused = hybrid.search([query], 3)[0]
+        print(f"{query!r}: BM25 {lex_ids.tolist()}, vector {vec_ids.tolist()}, "
+              f"fused {fused.tolist()}")
+        print("   top fused chunk:", repr(chunks[fused[0]][:90]))
+
+    # Scale: python hybrid_search.py 1000000 for the million-chunk run
+    n_chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    index = benchmark(n_chunks, sorted(set(tokenize(document))))
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(tmp)
+        start = time.perf_counter()
+        loaded = InvertedIndex.load(tmp)
+        query = "model retrieval"
+        same = np.array_equal(loaded.search(query)[0], index.search(query)[0])
+        print(f"Memory-mapped load: {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"same results: {same}")
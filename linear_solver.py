@@ -0,0 +1,143 @@
+"""
+# Linear Solver — Factor Once, Solve Many (instead of `np.linalg.inv`)
+
+Day 9 Q4 presents the inverse as the way to solve linear systems such as
+the regression normal equation. Forming `inv(A)` is slower and less
+accurate than factorizing `A`. `LinearSolver` factorizes once and reuses the
+factorization:
+
+- **Symmetric positive-definite** input (e.g. `XᵀX`) → Cholesky.
+- Other square input → LU with partial pivoting.
+- **Singular or ill-conditioned** input (LAPACK reciprocal condition number
+  below `rcond_min`) → least squares through a cached truncated SVD.
+
+Each factorization costs O(n³) once; every later `solve` costs O(n²) per
+right-hand side. A 2D `b` of shape `(n, k)` solves k right-hand sides in one
+LAPACK call.
+
+---
+"""
+
+import time
+
+import numpy as np
+from scipy import linalg
+from scipy.linalg import lapack
+
+
+class LinearSolver:
+    """Caches a Cholesky, LU or SVD factorization of A for repeated solves."""
+
+    def __init__(self, A, rcond_min=1e-12, sym_tol=1e-10):
+        A = np.asarray(A, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError(f"Expected a square matrix, got shape {A.shape}")
+        self.n = A.shape[0]
+        self.rcond_min = rcond_min
+        self.rcond = None
+        anorm = np.linalg.norm(A, 1)
+
+        if np.allclose(A, A.T, rtol=sym_tol, atol=sym_tol * max(anorm, 1.0)):
+            try:
+                self._factor = linalg.cho_factor(A, check_finite=False)
+                self.method = "cholesky"
+                self.rcond, _ = lapack.dpocon(self._factor[0], anorm,
+                                              uplo="L" if self._factor[1] else "U")
+            except linalg.LinAlgError:
+                self._factor = None  # symmetric but not positive definite
+        if self.rcond is None:
+            lu, piv, info = lapack.dgetrf(A)
+            if info == 0:
+                self._factor = (lu, piv)
+                self.method = "lu"
+                self.rcond, _ = lapack.dgecon(lu, anorm)
+            else:
+                self.rcond = 0.0
+
+        if not self.rcond > rcond_min:
+            U, s, Vt = np.linalg.svd(A)
+            keep = s > s[0] * max(rcond_min, np.finfo(float).eps * self.n)
+            self._factor = (U[:, keep], s[keep], Vt[keep])
+            self.method = "lstsq"
+            self.rank = int(keep.sum())
+        else:
+            self.rank = self.n
+
+    @property
+    def well_conditioned(self):
+        return self.method != "lstsq"
+
+    def solve(self, b):
+        """Solves A x = b for a vector b (n,) or a batch of right-hand sides (n, k)."""
+        b = np.asarray(b, dtype=np.float64)
+        if b.shape[0] != self.n:
+            raise ValueError(f"b has {b.shape[0]} rows, expected {self.n}")
+        if self.method == "cholesky":
+            return linalg.cho_solve(self._factor, b, check_finite=False)
+        if self.method == "lu":
+            return linalg.lu_solve(self._factor, b, check_finite=False)
+        U, s, Vt = self._factor
+        coef = U.T @ b
+        coef = coef / (s if b.ndim == 1 else s[:, np.newaxis])
+        return Vt.T @ coef
+
+
+def normal_equation(X, y, ridge=0.0):
+    """Least-squares coefficients via the normal equation, without forming an inverse."""
+    X = np.asarray(X, dtype=np.float64)
+    gram = X.T @ X
+    if ridge:
+        gram[np.diag_indices_from(gram)] += ridge
+    return LinearSolver(gram).solve(X.T @ np.asarray(y, dtype=np.float64))
+
+
+def benchmark(n=500, n_rhs=200, seed=0):
+    """Compares repeated solves: explicit inverse, np.linalg.solve, cached factorization."""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((2 * n, n))
+    A = X.T @ X
+    rhs = rng.standard_normal((n_rhs, n))
+
+    start = time.perf_counter()
+    inv_x = [np.linalg.inv(A) @ b for b in rhs]
+    t_inv = time.perf_counter() - start
+
+    start = time.perf_counter()
+    [np.linalg.solve(A, b) for b in rhs]
+    t_solve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solver = LinearSolver(A)
+    cached_x = [solver.solve(b) for b in rhs]
+    t_cached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_x = LinearSolver(A).solve(rhs.T)
+    t_batch = time.perf_counter() - start
+
+    print(f"n={n}, {n_rhs} right-hand sides ({solver.method}):")
+    print(f"  inv(A) @ b each time   {t_inv:.3f} s")
+    print(f"  np.linalg.solve each   {t_solve:.3f} s")
+    print(f"  cached factorization   {t_cached:.3f} s")
+    print(f"  one batched solve      {t_batch:.3f} s")
+    print("  results agree:", np.allclose(inv_x, cached_x), np.allclose(batch_x.T, cached_x))
+
+
+if __name__ == "__main__":
+    # Day 9 matrix m1 and a singular matrix
+    m1 = np.array([[1, 2], [3, 4]])
+    solver = LinearSolver(m1)
+    print("m1 method:", solver.method, "x =", solver.solve([5, 6]),
+          "check:", np.linalg.inv(m1) @ [5, 6])
+
+    singular = LinearSolver([[1, 2], [2, 4]])
+    print("Singular method:", singular.method, "rank:", singular.rank,
+          "x =", singular.solve([1, 2]), "(minimum-norm least squares)")
+
+    # Regression normal equation without np.linalg.inv
+    rng = np.random.default_rng(0)
+    X = np.column_stack([np.ones(100), rng.standard_normal((100, 2))])
+    y = X @ [1.0, 2.0, -3.0] + rng.normal(0, 0.1, 100)
+    print("Normal-equation coefficients:", normal_equation(X, y))
+
+    benchmark()
@@ -0,0 +1,182 @@
+"""
+# Monte Carlo — Vectorized, Parallel Probability Simulation
+
+Day 10 simulates two dice 1,000 times and derives P(sum=7 | one die=3) by
+hand. `MonteCarlo` generalizes that experiment:
+
+- A **sampler** draws a whole batch of trials at once, e.g. a `(batch, 2)`
+  array of dice.
+- **Events and conditions are vectorized predicates** over that batch:
+  functions returning a boolean array, one entry per trial.
+- Trials are generated in **fixed-size batches**, so memory stays bounded no
+  matter how many trials run (billions are fine; only counts are kept).
+- Batches run in a **process pool**. Batch i always uses stream i of
+  `np.random.SeedSequence(seed)`, so results are reproducible and do not
+  depend on the number of workers.
+- After every round the engine reports **running estimates with standard
+  errors** and **stops once every event reaches `target_se`**. Standard
+  errors use the Agresti-Coull interval (two pseudo-hits and two
+  pseudo-misses), so a rare event with no hits yet does not report an
+  error of zero, and no event stops before it has seen both a hit and a
+  miss.
+
+Samplers and predicates must be picklable (module-level functions or
+classes) to run in worker processes.
+
+---
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# (sampler, events, condition) shared by every batch in a worker (set by _init_worker)
+_WORKER_ARGS = None
+
+
+# 1. Built-in sampler and predicates for the Day 10 dice experiments
+class DiceSampler:
+    """Rolls n_dice fair dice with `sides` faces; returns an int array (batch, n_dice)."""
+
+    def __init__(self, n_dice=2, sides=6):
+        self.n_dice = n_dice
+        self.sides = sides
+
+    def __call__(self, rng, size):
+        return rng.integers(1, self.sides + 1, size=(size, self.n_dice), dtype=np.int8)
+
+
+class SumEquals:
+    """Predicate: the dice in a trial sum to `total`."""
+
+    def __init__(self, total):
+        self.total = total
+
+    def __call__(self, rolls):
+        return rolls.sum(axis=1) == self.total
+
+
+class AnyEquals:
+    """Predicate: at least one die shows `face`."""
+
+    def __init__(self, face):
+        self.face = face
+
+    def __call__(self, rolls):
+        return (rolls == self.face).any(axis=1)
+
+
+# 2. Batch kernel (runs in workers)
+def _init_worker(args):
+    global _WORKER_ARGS
+    _WORKER_ARGS = args
+
+
+def _run_batch(seed_seq, batch_size):
+    """Returns (hits per event, condition count) for one batch."""
+    sampler, events, condition = _WORKER_ARGS
+    rng = np.random.default_rng(seed_seq)
+    samples = sampler(rng, batch_size)
+    mask = condition(samples) if condition is not None else None
+    hits = []
+    for predicate in events.values():
+        hit = predicate(samples)
+        hits.append(np.count_nonzero(hit & mask if mask is not None else hit))
+    n_cond = np.count_nonzero(mask) if mask is not None else batch_size
+    return np.array(hits, dtype=np.int64), n_cond
+
+
+# 3. Engine
+class MonteCarlo:
+    """Estimates P(event [| condition]) for several events from batched simulation."""
+
+    def __init__(self, sampler, events, condition=None, batch_size=1000000,
+                 batches_per_round=8, workers=None, seed=0):
+        self.sampler = sampler
+        self.events = dict(events)
+        self.condition = condition
+        self.batch_size = batch_size
+        self.batches_per_round = batches_per_round
+        self.workers = workers
+        self.seed = seed
+
+    def _report(self, hits, n_cond, trials, z=1.96):
+        p = hits / max(n_cond, 1)
+        # Agresti-Coull: shrink towards 1/2 by z^2 pseudo-trials before the Wald formula
+        n_adj = n_cond + z ** 2
+        p_adj = (hits + z ** 2 / 2) / n_adj
+        se = np.sqrt(p_adj * (1 - p_adj) / n_adj)
+        misses = n_cond - hits
+        return {
+            "trials": trials,
+            "conditioned_trials": int(n_cond),
+            "estimates": {name: {"p": p[i], "std_error": se[i], "hits": int(hits[i])}
+                          for i, name in enumerate(self.events)},
+            "max_std_error": float(se.max()) if len(se) else 0.0,
+            "resolved": bool(np.all((hits > 0) & (misses > 0))),
+        }
+
+    def run(self, target_se=1e-4, max_trials=10 ** 9, callback=None):
+        """Runs rounds of batches until every event has a hit, a miss and std error <= target_se."""
+        args = (self.sampler, self.events, self.condition)
+        root = np.random.SeedSequence(self.seed)
+        hits = np.zeros(len(self.events), dtype=np.int64)
+        n_cond = 0
+        trials = 0
+
+        pool = None
+        if self.workers != 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(args,))
+        else:
+            _init_worker(args)
+        try:
+            while trials < max_trials:
+                n_batches = min(self.batches_per_round,
+                                -(-(max_trials - trials) // self.batch_size))
+                seeds = root.spawn(n_batches)  # continues the same stream sequence each round
+                sizes = [min(self.batch_size, max_trials - trials - i * self.batch_size)
+                         for i in range(n_batches)]
+                if pool is None:
+                    results = [_run_batch(s, size) for s, size in zip(seeds, sizes)]
+                else:
+                    results = list(pool.map(_run_batch, seeds, sizes))
+                for batch_hits, batch_cond in results:
+                    hits += batch_hits
+                    n_cond += batch_cond
+                trials += sum(sizes)
+
+                report = self._report(hits, n_cond, trials)
+                if callback is not None:
+                    callback(report)
+                if report["resolved"] and report["max_std_error"] <= target_se:
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return report
+
+
+if __name__ == "__main__":
+    # Day 10 Q9: P(sum=7 | one die=3); exact answer 2/11
+    mc = MonteCarlo(DiceSampler(), {"sum=7": SumEquals(7)}, condition=AnyEquals(3),
+                    batch_size=500000, workers=1)
+
+    def progress(report):
+        est = report["estimates"]["sum=7"]
+        print(f"  {report['trials']:>12,} trials: P={est['p']:.5f} ± {est['std_error']:.5f}")
+
+    start = time.perf_counter()
+    report = mc.run(target_se=2e-4, callback=progress)
+    print("P(sum=7 | one die=3):", report["estimates"]["sum=7"]["p"], "exact:", 2 / 11,
+          "Time:", round(time.perf_counter() - start, 3), "s")
+
+    # Unconditional sum distribution, in parallel processes
+    events = {f"sum={s}": SumEquals(s) for s in range(2, 13)}
+    start = time.perf_counter()
+    report = MonteCarlo(DiceSampler(), events, batch_size=1000000).run(target_se=1e-4)
+    print(f"Sum distribution from {report['trials']:,} trials "
+          f"({round(time.perf_counter() - start, 3)} s):")
+    for name, est in report["estimates"].items():
+        print(f"  P({name}) = {est['p']:.4f} ± {est['std_error']:.4f}")
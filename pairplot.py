@@ -0,0 +1,195 @@
+"""
+# Sampled Pairplot — Cached Pairwise Panels for Wide Frames
+
+`sns.pairplot` (Day 7) redraws all N² panels from the raw data on every call.
+This module keeps interactive EDA on wide frames fast:
+
+- **Scatter panels** draw a sample of the rows: a reservoir sample
+  (streaming, uniform) or a stratified sample (proportional per category, at
+  least one row per category so rare classes stay visible).
+- **Diagonal panels** are exact histograms over *all* rows, binned once per
+  column.
+- Every panel is rendered once to an RGBA image and cached per
+  `(row column, column)` pair. Adding a column to the grid only renders the
+  new row and column; all other panels are reused.
+
+---
+"""
+
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+# 1. Sampling
+def reservoir_sample(chunks, k, seed=0):
+    """Returns k items chosen uniformly from a stream of array chunks (Algorithm R)."""
+    rng = np.random.default_rng(seed)
+    reservoir = []
+    seen = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        fill = min(k - len(reservoir), len(chunk))
+        reservoir.extend(chunk[:fill])
+        rest = chunk[fill:]
+        if len(rest):
+            positions = np.arange(seen + fill, seen + len(chunk))
+            slots = rng.integers(0, positions + 1)
+            for item, slot in zip(rest[slots < k], slots[slots < k]):
+                reservoir[slot] = item
+        seen += len(chunk)
+    return np.array(reservoir)
+
+
+def _apportion(k, weights, capacity):
+    """Integer quotas summing to k, proportional to weights (largest remainder), within capacity."""
+    quotas = np.zeros(len(weights), dtype=np.int64)
+    remaining = k
+    active = capacity > quotas
+    while remaining > 0 and active.any():
+        share = remaining * np.where(active, weights, 0) / weights[active].sum()
+        add = np.floor(share).astype(np.int64)
+        leftover = remaining - add.sum()
+        add[np.argsort(add - share, kind="stable")[:leftover]] += 1
+        add = np.minimum(add, capacity - quotas)
+        quotas += add
+        remaining -= add.sum()
+        active = capacity > quotas
+    return quotas
+
+
+def stratified_sample(labels, k, seed=0):
+    """Returns min(k, len(labels)) row indices sampled proportionally per label.
+
+    Every label gets at least one row as long as k is at least the number of labels.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    uniques, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    k = min(k, len(labels))
+    if k >= len(uniques):
+        quotas = 1 + _apportion(k - len(uniques), counts, counts - 1)
+    else:
+        quotas = _apportion(k, counts, counts)
+    picked = []
+    for label_idx, quota in enumerate(quotas):
+        members = np.flatnonzero(inverse == label_idx)
+        picked.append(rng.choice(members, size=quota, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+# 2. Cached pairplot
+class SampledPairplot:
+    """Pairplot over a DataFrame with sampled scatters and cached panels."""
+
+    def __init__(self, df, sample_size=2000, stratify_by=None, bins=20,
+                 panel_px=160, seed=0, chunk_rows=100000):
+        self.df = df
+        self.bins = bins
+        self.panel_px = panel_px
+        self.stratify_by = stratify_by
+        self._panels = {}
+        self._hist = {}
+        self.renders = 0
+
+        n = len(df)
+        if stratify_by is not None:
+            self.sample_index = stratified_sample(df[stratify_by].to_numpy(), sample_size, seed)
+        elif n <= sample_size:
+            self.sample_index = np.arange(n)
+        else:
+            chunks = (np.arange(s, min(s + chunk_rows, n)) for s in range(0, n, chunk_rows))
+            self.sample_index = np.sort(reservoir_sample(chunks, sample_size, seed))
+        self.sample = df.iloc[self.sample_index]
+
+    def histogram(self, col):
+        """Returns exact (counts, edges) over all rows, binned once per column."""
+        if col not in self._hist:
+            values = self.df[col].dropna().to_numpy()
+            self._hist[col] = np.histogram(values, bins=self.bins)
+        return self._hist[col]
+
+    def _render_panel(self, row_col, col):
+        """Renders one panel to an RGBA array."""
+        dpi = 100
+        fig = Figure(figsize=(self.panel_px / dpi, self.panel_px / dpi), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes([0.18, 0.15, 0.78, 0.8])
+        ax.tick_params(labelsize=5)
+        if row_col == col:
+            counts, edges = self.histogram(col)
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge",
+                   color="skyblue", edgecolor="black", linewidth=0.3)
+        elif self.stratify_by is not None:
+            for _, group in self.sample.groupby(self.stratify_by):
+                ax.scatter(group[col], group[row_col], s=3)
+        else:
+            ax.scatter(self.sample[col], self.sample[row_col], s=3)
+        canvas.draw()
+        self.renders += 1
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+    def panel(self, row_col, col):
+        """Returns the cached panel image for (row_col, col), rendering it on first use."""
+        key = (row_col, col)
+        if key not in self._panels:
+            self._panels[key] = self._render_panel(row_col, col)
+        return self._panels[key]
+
+    def invalidate(self, col=None):
+        """Drops cached panels (all, or those involving col) after the data changes."""
+        if col is None:
+            self._panels.clear()
+            self._hist.clear()
+            return
+        self._hist.pop(col, None)
+        for key in [key for key in self._panels if col in key]:
+            del self._panels[key]
+
+    def draw(self, cols, figsize=None):
+        """Composes the pairplot grid for cols from cached panels and returns the figure."""
+        n = len(cols)
+        fig, axes = plt.subplots(n, n, figsize=figsize or (2 * n, 2 * n), squeeze=False)
+        for i, row_col in enumerate(cols):
+            for j, col in enumerate(cols):
+                ax = axes[i][j]
+                ax.imshow(self.panel(row_col, col))
+                ax.set_xticks([])
+                ax.set_yticks([])
+                if i == n - 1:
+                    ax.set_xlabel(col)
+                if j == 0:
+                    ax.set_ylabel(row_col)
+        fig.subplots_adjust(wspace=0.02, hspace=0.02)
+        return fig
+
+
+if __name__ == "__main__":
+    import matplotlib
+    matplotlib.use("Agg")
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    n = 1000000
+    df = pd.DataFrame(rng.standard_normal((n, 6)), columns=list("ABCDEF"))
+    df["City"] = rng.choice(["NY", "LA", "SF"], size=n, p=[0.7, 0.29, 0.01])
+
+    start = time.perf_counter()
+    pp = SampledPairplot(df, sample_size=2000)
+    fig = pp.draw(["A", "B", "C", "D", "E"])
+    plt.close(fig)
+    print("5 columns:", pp.renders, "panels rendered,",
+          round(time.perf_counter() - start, 3), "s")
+
+    start = time.perf_counter()
+    before = pp.renders
+    fig = pp.draw(["A", "B", "C", "D", "E", "F"])
+    plt.close(fig)
+    print("Add column F:", pp.renders - before, "new panels rendered,",
+          round(time.perf_counter() - start, 3), "s")
+
+    strat = SampledPairplot(df, sample_size=500, stratify_by="City")
+    print("Stratified sample per city:", strat.sample["City"].value_counts().to_dict())
@@ -0,0 +1,259 @@
+"""
+# Reranker — Batched, Cached, Cascaded Reranking of Retrieved Candidates
+
+The LLM+RAG notes mention reranking models (cross-encoders) as a way to
+improve retrieval quality. Reranking is also the slowest step of the RAG
+path, so this stage keeps model calls few and large:
+
+- **Scorers** are pluggable. A scorer has a `model_id` and a
+  `score_pairs(queries, texts)` method returning one score per pair.
+  `ModelScorer` wraps any batch function (e.g. a cross-encoder's predict).
+  `BM25Scorer` is a local lexical default that needs no model.
+- **Micro-batches by token budget**: pairs are sorted by length and grouped
+  so that `batch size × longest pair` (the padded size a model actually
+  computes) stays within `max_batch_tokens`. Batches span queries.
+- **Score cache**: an LRU keyed by `(model_id, query, text)` digests, so
+  repeated pairs (popular queries, overlapping candidate lists) are scored
+  once.
+- **Cascade**: stages run cheapest first. Each stage keeps its top `keep`
+  candidates per query, so the expensive model only sees what survives.
+
+---
+"""
+
+import hashlib
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from bpe_tokenizer import pretokenize
+from embedding_cache import cache_key
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _words(text):
+    return WORD_PATTERN.findall(text.lower())
+
+
+# 1. Scorers
+class BM25Scorer:
+    """Okapi BM25 of a text for a query; IDF and average length come from fit(corpus)."""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.idf = {}
+        self.n_docs = 0
+        self.avg_length = None
+        self.model_id = f"bm25-k1={k1}-b={b}-unfitted"
+
+    def fit(self, corpus):
+        """Collects document frequencies; unfitted scorers use idf = 1 and no length norm."""
+        df = Counter()
+        total = 0
+        n_docs = 0
+        for text in corpus:
+            words = _words(text)
+            df.update(set(words))
+            total += len(words)
+            n_docs += 1
+        self.idf = {w: math.log(1 + (n_docs - f + 0.5) / (f + 0.5)) for w, f in df.items()}
+        self.n_docs = n_docs
+        self.avg_length = total / max(n_docs, 1)
+        # Two corpora with the same size and length can differ in IDF; key the cache on the table
+        digest = hashlib.blake2b(repr(sorted(self.idf.items())).encode("utf-8"), digest_size=8)
+        self.model_id = (f"bm25-k1={self.k1}-b={self.b}-n={n_docs}-len={total}"
+                         f"-idf={digest.hexdigest()}")
+        return self
+
+    def score_pairs(self, queries, texts):
+        k1, b = self.k1, self.b
+        # Terms never seen while fitting get the idf of a document frequency of zero
+        unseen = math.log(1 + (self.n_docs + 0.5) / 0.5) if self.n_docs else 1.0
+        scores = np.empty(len(texts))
+        for i, (query, text) in enumerate(zip(queries, texts)):
+            words = _words(text)
+            tf = Counter(words)
+            norm = k1 * (1 - b + b * len(words) / self.avg_length) if self.avg_length else k1
+            s = 0.0
+            for term in set(_words(query)):
+                f = tf.get(term)
+                if f:
+                    s += self.idf.get(term, unseen) * f * (k1 + 1) / (f + norm)
+            scores[i] = s
+        return scores
+
+
+class ModelScorer:
+    """Wraps a batch scoring function fn(queries, texts) -> scores (e.g. a cross-encoder)."""
+
+    def __init__(self, fn, model_id):
+        self.fn = fn
+        self.model_id = model_id
+
+    def score_pairs(self, queries, texts):
+        return np.asarray(self.fn(queries, texts), dtype=np.float64)
+
+
+# 2. Score cache
+class ScoreCache:
+    """LRU cache of pair scores keyed by a digest of (model id, query, text)."""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._scores = OrderedDict()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(model_id, query, text):
+        return cache_key(query + "\0" + text, model_id)
+
+    def get(self, key):
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+    def __len__(self):
+        return len(self._scores)
+
+
+# 3. Token-budget micro-batches
+def _count_pieces(text):
+    return len(pretokenize(text))
+
+
+def micro_batches(lengths, max_batch_tokens=8192, max_batch_size=64):
+    """Index batches over pairs sorted by length, each with size × longest <= max_batch_tokens."""
+    order = np.argsort(lengths, kind="stable")
+    batch, longest = [], 0
+    for i in order:
+        n = max(int(lengths[i]), 1)
+        full = (len(batch) >= max_batch_size
+                or (len(batch) + 1) * max(longest, n) > max_batch_tokens)
+        if batch and full:
+            yield batch
+            batch, longest = [], 0
+        batch.append(int(i))
+        longest = max(longest, n)
+    if batch:
+        yield batch
+
+
+# 4. Rerank stage
+class Reranker:
+    """Runs cheap-to-expensive scorer stages; each stage keeps its top `keep` per query."""
+
+    def __init__(self, stages=None, tokenizer=None, max_batch_tokens=8192, max_batch_size=64,
+                 cache_size=100000):
+        self.stages = stages or [(BM25Scorer(), None)]
+        self.count_tokens = tokenizer.count_tokens if tokenizer is not None else _count_pieces
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.cache = ScoreCache(cache_size)
+        self.stats = {"pairs": 0, "scored": 0, "batches": 0, "seconds": 0.0}
+
+    def _score(self, scorer, queries, texts):
+        """Scores pairs through the cache; misses go to the scorer in token-budget batches."""
+        keys = [self.cache.key(scorer.model_id, q, t) for q, t in zip(queries, texts)]
+        scores = np.array([self.cache.get(k) for k in keys], dtype=np.float64)
+        missing = np.flatnonzero(np.isnan(scores))
+        self.stats["pairs"] += len(keys)
+        if len(missing):
+            lengths = np.array([self.count_tokens(queries[i]) + self.count_tokens(texts[i])
+                                for i in missing])
+            start = time.perf_counter()
+            for batch in micro_batches(lengths, self.max_batch_tokens, self.max_batch_size):
+                rows = missing[batch]
+                batch_scores = scorer.score_pairs([queries[i] for i in rows],
+                                                  [texts[i] for i in rows])
+                scores[rows] = batch_scores
+                for i, s in zip(rows, batch_scores):
+                    self.cache.put(keys[i], float(s))
+                self.stats["batches"] += 1
+            self.stats["scored"] += len(missing)
+            self.stats["seconds"] += time.perf_counter() - start
+        return scores
+
+    def rerank_batch(self, queries, candidates, top_k=None):
+        """For each query, returns (candidate indices best first, final-stage scores)."""
+        if not len(queries):
+            return []
+        alive = [np.arange(len(c)) for c in candidates]
+        scores = [np.zeros(len(c)) for c in candidates]
+        for scorer, keep in self.stages:
+            owner = np.repeat(np.arange(len(queries)), [len(a) for a in alive])
+            flat = np.concatenate(alive) if alive else np.empty(0, dtype=np.int64)
+            pair_scores = self._score(scorer, [queries[q] for q in owner],
+                                      [candidates[q][c] for q, c in zip(owner, flat)])
+            bounds = np.cumsum([len(a) for a in alive])[:-1]
+            for q, (idx, s) in enumerate(zip(np.split(flat, bounds), np.split(pair_scores, bounds))):
+                order = np.argsort(-s, kind="stable")[:keep]
+                alive[q], scores[q] = idx[order], s[order]
+        return [(a[:top_k], s[:top_k]) for a, s in zip(alive, scores)]
+
+    def rerank(self, query, candidates, top_k=None):
+        return self.rerank_batch([query], [candidates], top_k)[0]
+
+
+if __name__ == "__main__":
+    import json
+    import os
+
+    from chunker import chunk_text
+    from embedding_cache import HashingEmbedder
+    from vector_index import FlatIndex
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "LLM+RAG_interview_questions.ipynb")) as f:
+        cells = json.load(f)["cells"]
+    document = "\n\n".join("".join(c["source"]) for c in cells if c["cell_type"] == "markdown")
+    chunks = [c["text"] for c in chunk_text(document, max_tokens=80, overlap=10)]
+    questions = ["how does tokenization affect cost", "what is hallucination and how to reduce it",
+                 "choosing a vector database", "evaluate retrieval precision and recall",
+                 "backfill embeddings with zero downtime", "what is a reranker"]
+
+    # First-stage retrieval: top 30 chunks per question from the hashing embedder
+    embedder = HashingEmbedder()
+    index = FlatIndex(embedder.dim).add(embedder.embed(chunks))
+    ids, _ = index.search(embedder.embed(questions), k=30)
+    candidates = [[chunks[i] for i in row] for row in ids]
+
+    bm25 = BM25Scorer().fit(chunks)
+
+    # Stand-in for a cross-encoder: dense similarity plus a per-batch "inference" cost
+    def slow_model(queries, texts):
+        time.sleep(0.002 + 2e-6 * len(texts) * max(len(_words(t)) for t in texts))
+        q, t = embedder.embed(queries), embedder.embed(texts)
+        return np.einsum("ij,ij->i", q, t)
+
+    model = ModelScorer(slow_model, "fake-cross-encoder-v1")
+    setups = {
+        "model only": [(model, None)],
+        "BM25 keep 8 -> model": [(bm25, 8), (model, None)],
+    }
+    for name, stages in setups.items():
+        reranker = Reranker(stages, max_batch_tokens=2048)
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            ranked = reranker.rerank_batch(questions, candidates, top_k=3)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name:<22} {run}: {elapsed:7.1f} ms, {reranker.stats['scored']} pairs scored "
+                  f"in {reranker.stats['batches']} batches, cache hits {reranker.cache.hits}")
+
+    best, score = Reranker().rerank(questions[0], candidates[0], top_k=1)
+    print(f"BM25 default, best chunk for {questions[0]!r} (score {score[0]:.2f}):",
+          repr(candidates[0][best[0]][:100]))
@@ -0,0 +1,250 @@
+"""
+# Resampling — Parallel Bootstrap, Permutation Tests and Goodness of Fit
+
+Day 8 Q17 answers "how to check distribution fit" with the names of tests
+only. This module runs those tests, plus bootstrap confidence intervals and
+permutation tests, fast enough for thousands of runs per nightly job.
+
+## How it works
+- Resample **indices are generated in vectorized batches** of shape
+  `(batch, n)` and the statistic is evaluated along `axis=1` (so statistics
+  must accept an `axis` argument, like `np.mean` or `np.median`).
+- Batches are spread across a **process pool**. Every batch gets its own RNG
+  stream from `np.random.SeedSequence(seed).spawn(...)`, so results are
+  reproducible and independent of the number of workers.
+- Data is sent to each worker once through the pool initializer.
+- Work runs in rounds; after each round a convergence check runs and the job
+  **stops early** once the Monte Carlo standard error is small enough
+  (bootstrap: of both CI endpoints, relative to the CI width; permutation /
+  fit tests: of the p-value).
+
+## Goodness of fit
+`goodness_of_fit` reports scipy's KS and Anderson-Darling statistics and a
+parametric-bootstrap KS p-value, which stays valid when the distribution
+parameters are estimated from the same data (plain `kstest` does not).
+
+---
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import special, stats
+
+# Arguments shared by every batch in a worker process (set by _init_worker)
+_WORKER_ARGS = None
+
+# Upper bound on batch * n resample indices held at once
+MAX_BATCH_ELEMENTS = 2000000
+
+
+# 1. Batch kernels (run in workers)
+def _init_worker(args):
+    """Stores the shared data once per worker process."""
+    global _WORKER_ARGS
+    _WORKER_ARGS = args
+
+
+def _bootstrap_batch(seed_seq, batch_size):
+    data, statistic = _WORKER_ARGS
+    rng = np.random.default_rng(seed_seq)
+    idx = rng.integers(0, len(data), size=(batch_size, len(data)))
+    return statistic(data[idx], axis=1)
+
+
+def _permutation_batch(seed_seq, batch_size):
+    x, y, statistic = _WORKER_ARGS
+    rng = np.random.default_rng(seed_seq)
+    pooled = np.concatenate([x, y])
+    perm = rng.permuted(np.broadcast_to(pooled, (batch_size, len(pooled))), axis=1)
+    return statistic(perm[:, :len(x)], perm[:, len(x):], axis=1)
+
+
+def _fit_cdf(dist, samples):
+    """Fits dist to each row of samples and returns the fitted CDF values."""
+    if dist == "norm":
+        loc = samples.mean(axis=1, keepdims=True)
+        scale = samples.std(axis=1, ddof=1, keepdims=True)
+        return special.ndtr((samples - loc) / scale)
+    if dist == "expon":
+        loc = samples.min(axis=1, keepdims=True)
+        scale = samples.mean(axis=1, keepdims=True) - loc
+        return -np.expm1(-(samples - loc) / scale)
+    raise ValueError(f"Unsupported distribution '{dist}', use 'norm' or 'expon'")
+
+
+def ks_statistic(dist, samples):
+    """Vectorized KS distance of each row against dist fitted to that row."""
+    samples = np.sort(np.atleast_2d(samples), axis=1)
+    n = samples.shape[1]
+    cdf = _fit_cdf(dist, samples)
+    i = np.arange(1, n + 1)
+    return np.maximum((i / n - cdf).max(axis=1), (cdf - (i - 1) / n).max(axis=1))
+
+
+def _fit_batch(seed_seq, batch_size):
+    n, dist = _WORKER_ARGS
+    rng = np.random.default_rng(seed_seq)
+    if dist == "norm":
+        samples = rng.standard_normal((batch_size, n))
+    else:
+        samples = rng.standard_exponential((batch_size, n))
+    return ks_statistic(dist, samples)
+
+
+# 2. Round-based engine with early stopping
+def _default_batch(n):
+    return max(1, min(1000, MAX_BATCH_ELEMENTS // max(1, n)))
+
+
+def run_replicates(batch_fn, worker_args, max_resamples, converged, batch_size,
+                   workers=None, seed=0, min_resamples=1000):
+    """Runs batch_fn in rounds until converged(replicates) or max_resamples is reached."""
+    n_batches = -(-max_resamples // batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    per_round = max(1, -(-min_resamples // batch_size))
+
+    pool = None
+    if workers != 1:
+        workers = workers or os.cpu_count() or 1
+        # Every round gives each worker at least one batch, so the pool runs them concurrently
+        per_round = max(per_round, workers)
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(worker_args,))
+    else:
+        _init_worker(worker_args)
+
+    results = []
+    try:
+        for start in range(0, n_batches, per_round):
+            round_seeds = seeds[start:start + per_round]
+            if pool is None:
+                results.extend(batch_fn(s, batch_size) for s in round_seeds)
+            else:
+                results.extend(pool.map(batch_fn, round_seeds, [batch_size] * len(round_seeds)))
+            replicates = np.concatenate(results)
+            if converged(replicates):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return np.concatenate(results)[:max_resamples]
+
+
+def _p_value_converged(observed, tol, extreme):
+    """Stops once the Monte Carlo standard error of the p-value is below tol."""
+    def check(replicates):
+        p = (extreme(replicates, observed).sum() + 1) / (len(replicates) + 1)
+        return np.sqrt(p * (1 - p) / len(replicates)) < tol
+    return check
+
+
+# 3. Public tests
+def bootstrap_ci(data, statistic=np.mean, confidence=0.95, max_resamples=100000,
+                 rtol=0.01, batch_size=None, workers=None, seed=0):
+    """Percentile bootstrap CI; stops once each endpoint's Monte Carlo SE is <= rtol * width."""
+    data = np.asarray(data, dtype=np.float64)
+    alpha = (1 - confidence) / 2
+
+    def converged(replicates):
+        # SE of the q-quantile of B replicates: half the spread of quantiles q ± sqrt(q(1-q)/B)
+        d = np.sqrt(alpha * (1 - alpha) / len(replicates))
+        levels = np.clip([alpha - d, alpha, alpha + d,
+                          1 - alpha - d, 1 - alpha, 1 - alpha + d], 0, 1)
+        q = np.quantile(replicates, levels)
+        se = max(q[2] - q[0], q[5] - q[3]) / 2
+        return se <= rtol * (q[4] - q[1])
+
+    replicates = run_replicates(_bootstrap_batch, (data, statistic), max_resamples,
+                                converged, batch_size or _default_batch(len(data)),
+                                workers, seed)
+    lo, hi = np.quantile(replicates, [alpha, 1 - alpha])
+    return {
+        "estimate": statistic(data),
+        "ci": (lo, hi),
+        "std_error": replicates.std(ddof=1),
+        "n_resamples": len(replicates),
+    }
+
+
+def mean_difference(x, y, axis=None):
+    return np.mean(x, axis=axis) - np.mean(y, axis=axis)
+
+
+def permutation_test(x, y, statistic=mean_difference, max_resamples=100000,
+                     tol=0.002, batch_size=None, workers=None, seed=0):
+    """Two-sided two-sample permutation test on statistic(x, y, axis)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    observed = statistic(x, y)
+
+    def extreme(replicates, obs):
+        return np.abs(replicates) >= np.abs(obs)
+
+    replicates = run_replicates(_permutation_batch, (x, y, statistic), max_resamples,
+                                _p_value_converged(observed, tol, extreme),
+                                batch_size or _default_batch(len(x) + len(y)),
+                                workers, seed)
+    p = (extreme(replicates, observed).sum() + 1) / (len(replicates) + 1)
+    return {"statistic": observed, "p_value": p, "n_resamples": len(replicates)}
+
+
+def goodness_of_fit(data, dist="norm", max_resamples=20000, tol=0.002,
+                    batch_size=None, workers=None, seed=0):
+    """KS and Anderson-Darling fit checks with a parametric-bootstrap KS p-value."""
+    data = np.asarray(data, dtype=np.float64)
+    observed = ks_statistic(dist, data)[0]
+    # The fitted KS statistic is location/scale invariant, so standard samples suffice
+    replicates = run_replicates(_fit_batch, (len(data), dist), max_resamples,
+                                _p_value_converged(observed, tol, np.greater_equal),
+                                batch_size or _default_batch(len(data)), workers, seed)
+    try:
+        anderson = stats.anderson(data, dist=dist, method="interpolate")
+    except TypeError:  # SciPy < 1.17 has no method argument
+        anderson = stats.anderson(data, dist=dist)
+    critical = getattr(anderson, "critical_values", None)
+    return {
+        "ks_statistic": observed,
+        "ks_p_value": (np.sum(replicates >= observed) + 1) / (len(replicates) + 1),
+        "ks_naive_p_value": stats.kstest(data, dist, args=getattr(stats, dist).fit(data)).pvalue,
+        "anderson_statistic": anderson.statistic,
+        "anderson_p_value": getattr(anderson, "pvalue", None),
+        "anderson_critical_values": (None if critical is None
+                                     else dict(zip(anderson.significance_level, critical))),
+        "n_resamples": len(replicates),
+    }
+
+
+if __name__ == "__main__":
+    # Day 8 data
+    data = [12, 15, 12, 18, 22, 15, 18, 20, 16, 18, 17, 19, 21, 22, 14]
+    print("Bootstrap CI of the mean:", bootstrap_ci(data, workers=1))
+    print("Bootstrap CI of the median:", bootstrap_ci(data, np.median, workers=1))
+    print("Normal fit:", goodness_of_fit(data, workers=1))
+
+    rng = np.random.default_rng(0)
+    a = rng.normal(0.0, 1, 200)
+    b = rng.normal(0.3, 1, 200)
+    print("Permutation test:", permutation_test(a, b, workers=1))
+
+    # Benchmark: naive Python loop vs vectorized batches vs process pool
+    big = rng.exponential(size=2000)
+    n_resamples = 20000
+
+    start = time.perf_counter()
+    loop_rng = np.random.default_rng(0)
+    naive = [np.mean(loop_rng.choice(big, size=len(big))) for _ in range(n_resamples)]
+    print("Naive loop:", round(time.perf_counter() - start, 3), "s")
+
+    for workers in (1, None):
+        start = time.perf_counter()
+        result = bootstrap_ci(big, max_resamples=n_resamples, rtol=0, workers=workers)
+        print(f"Vectorized (workers={workers}):", round(time.perf_counter() - start, 3), "s",
+              result["ci"])
+
+    start = time.perf_counter()
+    result = bootstrap_ci(big, max_resamples=n_resamples, workers=1)
+    print("With early stopping:", round(time.perf_counter() - start, 3), "s,",
+          result["n_resamples"], "resamples")
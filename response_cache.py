@@ -0,0 +1,268 @@
+"""
+# Response Cache — Exact and Semantic Caching of LLM Responses
+
+The LLM+RAG notes' cost and latency section recommends caching frequent
+prompts and responses. `ResponseCache` has two tiers in front of any model
+backend:
+
+1. **Exact tier**: a dict from the digest of the normalized prompt to its
+   entry. Normalization applies NFKC, case folding and whitespace
+   collapsing.
+2. **Semantic tier**: prompt embeddings are kept in one preallocated
+   matrix. A lookup is a single matrix-vector product. The best live entry
+   in the same scope with cosine similarity ≥ `threshold` is a hit.
+
+Every key is **scoped** by prompt template version, model name and model
+parameters (temperature, max tokens, ...). Changing any of them never
+serves an old response.
+
+Entries expire after a **TTL** and are evicted least-recently-used once
+`max_entries` or `max_bytes` of responses is exceeded. Counters for hits
+per tier, misses, evictions and expirations, plus lookup and backend
+latency percentiles, are exposed by `stats()` for monitoring. `FakeModel`
+is a local backend with configurable latency for tests and benchmarks.
+
+---
+"""
+
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import deque
+
+import numpy as np
+
+from embedding_cache import HashingEmbedder
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """NFKC, case-folded, whitespace-collapsed prompt text."""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", prompt).casefold()).strip()
+
+
+def scope_key(template_version, model, params):
+    """Identifies everything besides the prompt that determines a response."""
+    return json.dumps([template_version, model, params], sort_keys=True, default=str)
+
+
+def _digest(*parts):
+    return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+# 1. Local fake backend
+class FakeModel:
+    """Deterministic stand-in for an LLM call: fixed latency plus a per-output-token cost."""
+
+    def __init__(self, latency=0.05, seconds_per_token=0.0):
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.calls = 0
+
+    def __call__(self, prompt, model, **params):
+        self.calls += 1
+        words = normalize_prompt(prompt).split()
+        answer = f"[{model}] answer to: {' '.join(words[:12])}"
+        time.sleep(self.latency + self.seconds_per_token * len(answer.split()))
+        return answer
+
+
+# 2. Cache
+class ResponseCache:
+    """Two-tier (exact, semantic) response cache with TTL and LRU size eviction."""
+
+    def __init__(self, embedder=None, threshold=0.9, ttl=3600.0, max_entries=10000,
+                 max_bytes=64 * 1024 * 1024, clock=time.monotonic, latency_window=10000):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+        self.embeddings = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self.scope = np.full(max_entries, -1, dtype=np.int64)
+        self.expires = np.zeros(max_entries)
+        self.last_used = np.zeros(max_entries, dtype=np.int64)  # 0 = free slot
+        self.sizes = np.zeros(max_entries, dtype=np.int64)
+        self.responses = [None] * max_entries
+        self._keys = [None] * max_entries
+        self._exact = {}
+        self._scopes = {}
+        self._tick = 0
+        self._bytes = 0
+
+        self.counters = {"lookups": 0, "exact_hits": 0, "semantic_hits": 0, "misses": 0,
+                         "puts": 0, "evictions": 0, "expirations": 0, "backend_calls": 0}
+        self.lookup_latency = deque(maxlen=latency_window)
+        self.backend_latency = deque(maxlen=latency_window)
+
+    def __len__(self):
+        return len(self._exact)
+
+    def _scope_id(self, template_version, model, params):
+        key = scope_key(template_version, model, params)
+        return self._scopes.setdefault(key, len(self._scopes))
+
+    def _touch(self, slot):
+        self._tick += 1
+        self.last_used[slot] = self._tick
+
+    def _remove(self, slots):
+        for s in slots:
+            del self._exact[self._keys[s]]
+            self.responses[s] = self._keys[s] = None
+        self._bytes -= int(self.sizes[slots].sum())
+        self.last_used[slots] = 0
+        self.sizes[slots] = 0
+        self.scope[slots] = -1
+
+    def expire(self):
+        """Drops every expired entry; returns how many were dropped."""
+        dead = np.flatnonzero((self.last_used > 0) & (self.expires <= self.clock()))
+        self._remove(dead)
+        self.counters["expirations"] += len(dead)
+        return len(dead)
+
+    # Lookup
+    def get(self, prompt, template_version="v1", model="default", semantic=True, **params):
+        """Returns (response, tier) with tier 'exact' or 'semantic', or (None, None) on a miss."""
+        start = time.perf_counter()
+        self.counters["lookups"] += 1
+        normalized = normalize_prompt(prompt)
+        scope = self._scope_id(template_version, model, params)
+        now = self.clock()
+        response, tier = None, None
+
+        slot = self._exact.get(_digest(str(scope), normalized))
+        if slot is not None:
+            if self.expires[slot] > now:
+                response, tier = self.responses[slot], "exact"
+            else:
+                self._remove([slot])
+                self.counters["expirations"] += 1
+        if response is None and semantic and len(self._exact):
+            query = self.embedder.embed([normalized])[0]
+            sims = self.embeddings @ query
+            live = (self.scope == scope) & (self.expires > now)
+            sims[~live] = -np.inf
+            slot = int(np.argmax(sims))
+            if sims[slot] >= self.threshold:
+                response, tier = self.responses[slot], "semantic"
+
+        if response is None:
+            self.counters["misses"] += 1
+        else:
+            self._touch(slot)
+            self.counters[f"{tier}_hits"] += 1
+        self.lookup_latency.append(time.perf_counter() - start)
+        return response, tier
+
+    # Insertion and eviction
+    def _full(self, size):
+        return len(self._exact) >= self.max_entries or self._bytes + size > self.max_bytes
+
+    def _free_slot(self, size):
+        """A slot for a new entry, evicting expired and then least recently used entries."""
+        if self._full(size):
+            self.expire()
+        while self._full(size):
+            used = np.where(self.last_used > 0, self.last_used, np.iinfo(np.int64).max)
+            self._remove([int(np.argmin(used))])
+            self.counters["evictions"] += 1
+        return int(np.argmin(self.last_used))
+
+    def put(self, prompt, response, template_version="v1", model="default", ttl=None, **params):
+        normalized = normalize_prompt(prompt)
+        scope = self._scope_id(template_version, model, params)
+        key = _digest(str(scope), normalized)
+        size = len(str(response).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._exact:
+            self._remove([self._exact[key]])
+        slot = self._free_slot(size)
+        self._exact[key] = slot
+        self._keys[slot] = key
+        self.responses[slot] = response
+        self.embeddings[slot] = self.embedder.embed([normalized])[0]
+        self.scope[slot] = scope
+        self.expires[slot] = self.clock() + (self.ttl if ttl is None else ttl)
+        self.sizes[slot] = size
+        self._bytes += size
+        self._touch(slot)
+        self.counters["puts"] += 1
+
+    # Read-through
+    def complete(self, prompt, backend, template_version="v1", model="default", semantic=True,
+                 ttl=None, **params):
+        """Cached response for prompt, calling backend(prompt, model, **params) on a miss."""
+        response, _ = self.get(prompt, template_version, model, semantic, **params)
+        if response is not None:
+            return response
+        start = time.perf_counter()
+        response = backend(prompt, model, **params)
+        self.backend_latency.append(time.perf_counter() - start)
+        self.counters["backend_calls"] += 1
+        self.put(prompt, response, template_version, model, ttl, **params)
+        return response
+
+    # Monitoring
+    def stats(self):
+        c = dict(self.counters)
+        hits = c["exact_hits"] + c["semantic_hits"]
+        c["hit_rate"] = hits / c["lookups"] if c["lookups"] else 0.0
+        c["entries"] = len(self)
+        c["bytes"] = self._bytes
+        for name, window in (("lookup", self.lookup_latency), ("backend", self.backend_latency)):
+            if window:
+                p50, p99 = np.percentile(np.array(window) * 1000, [50, 99]).tolist()
+                c[f"{name}_p50_ms"], c[f"{name}_p99_ms"] = p50, p99
+        if self.backend_latency:
+            c["saved_seconds"] = hits * float(np.mean(self.backend_latency))
+        return c
+
+
+if __name__ == "__main__":
+    backend = FakeModel(latency=0.02)
+
+    # Injectable clock so expiry can be shown without sleeping
+    now = [0.0]
+    cache = ResponseCache(threshold=0.8, ttl=600, clock=lambda: now[0])
+
+    print(cache.complete("What is RAG?", backend, temperature=0.0))
+    print(cache.get("  what is   RAG? ", temperature=0.0), "<- exact tier after normalization")
+    print(cache.get("What is RAG", temperature=0.0), "<- semantic tier")
+    print(cache.get("What is RAG?", temperature=0.7), "<- other model params, separate scope")
+    print(cache.get("What is RAG?", template_version="v2", temperature=0.0), "<- new template")
+    now[0] += 601
+    print(cache.get("What is RAG?", temperature=0.0), "<- expired after the TTL")
+
+    # Traffic with repeats and near-duplicates, as in production prompt logs
+    rng = np.random.default_rng(0)
+    topics = ["tokenization", "embeddings", "hallucinations", "vector databases", "rerankers",
+              "chunking", "prompt caching", "evaluation metrics", "fine-tuning", "RAG latency"]
+    forms = ["What are {}?", "what are {}", "Explain {} briefly.", "Explain {} briefly",
+             "How do {} work?", "how do {} work"]
+    prompts = [forms[rng.integers(len(forms))].format(topics[min(rng.zipf(1.5), len(topics)) - 1])
+               for _ in range(300)]
+
+    cache = ResponseCache(threshold=0.85, max_entries=1000)
+    start = time.perf_counter()
+    for prompt in prompts:
+        cache.complete(prompt, backend, model="fake-llm", temperature=0.0)
+    elapsed = time.perf_counter() - start
+    print(f"{len(prompts)} prompts in {elapsed:.2f} s "
+          f"(uncached: {len(prompts) * backend.latency:.2f} s)")
+    print({k: round(v, 3) if isinstance(v, float) else v for k, v in cache.stats().items()})
+
+    # Size-based eviction keeps the most recently used entries
+    small = ResponseCache(max_entries=50, max_bytes=2000)
+    for i in range(200):
+        small.put(f"prompt number {i}", "x" * 100)
+    print("Bounded cache:", len(small), "entries,", small.stats()["bytes"], "bytes,",
+          small.stats()["evictions"], "evictions; newest kept:",
+          small.get("prompt number 199", semantic=False)[1])
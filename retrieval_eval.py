@@ -0,0 +1,195 @@
+"""
+# Retrieval Evaluation — Precision@k, Recall@k, MRR and nDCG in One Pass
+
+The LLM+RAG notes name Precision@k, Recall@k and MRR as the retrieval
+quality metrics. Each index change is evaluated on tens of thousands of
+queries, so every metric is computed **for all k = 1..K at once** from two
+arrays:
+
+- `results`: ranked ids, shape (n_queries, K), padded with -1.
+- `qrels`: relevance judgments as parallel arrays `(query, doc, grade)`.
+  Grade 1 means relevant; higher grades are used by nDCG.
+
+Judgments are joined to results by a sorted-key `searchsorted`, not a
+Python dict. After that, each metric is a cumulative sum along the rank
+axis:
+
+- `precision@k = hits@k / k`, `recall@k = hits@k / n_relevant`
+- `MRR@k` counts 1 / first-hit rank when the first hit is within k
+- `nDCG@k = DCG@k / IDCG@k` with gain `2^grade - 1` and discount
+  `log2(rank + 1)`
+
+`evaluate` times the search function per query in the same run, and
+`compare` puts quality and latency deltas between two runs side by side.
+
+---
+"""
+
+import time
+
+import numpy as np
+
+
+def qrels_from_lists(relevant):
+    """(query, doc, grade) arrays from a list of relevant-id collections (grade 1)."""
+    lengths = [len(r) for r in relevant]
+    query = np.repeat(np.arange(len(relevant)), lengths)
+    doc = np.fromiter((d for r in relevant for d in r), dtype=np.int64, count=sum(lengths))
+    return query, doc, np.ones(len(doc))
+
+
+# 1. Relevance matrix
+def relevance_matrix(results, qrels):
+    """Grade of every retrieved id, shape (n_queries, K); 0 for unjudged ids and padding."""
+    results = np.asarray(results, dtype=np.int64)
+    query, doc, grade = (np.asarray(a) for a in qrels)
+    n_queries, K = results.shape
+    base = int(max(doc.max(initial=0), results.max(initial=0))) + 1
+    keys = query.astype(np.int64) * base + doc
+    order = np.argsort(keys)
+    keys, grades = keys[order], np.asarray(grade, dtype=np.float64)[order]
+
+    if len(keys) == 0:
+        return np.zeros((n_queries, K))
+
+    lookup = (np.arange(n_queries, dtype=np.int64)[:, np.newaxis] * base + results).ravel()
+    pos = np.minimum(np.searchsorted(keys, lookup), len(keys) - 1)
+    rel = np.where(keys[pos] == lookup, grades[pos], 0.0).reshape(n_queries, K)
+    rel[results < 0] = 0
+    return rel
+
+
+def _ideal_grades(qrels, n_queries, K):
+    """Per query, its judged grades sorted descending (truncated / zero-padded to K)."""
+    query, _, grade = (np.asarray(a) for a in qrels)
+    grade = np.asarray(grade, dtype=np.float64)
+    keep = grade > 0
+    query, grade = query[keep], grade[keep]
+    order = np.lexsort((-grade, query))
+    query, grade = query[order], grade[order]
+    starts = np.searchsorted(query, np.arange(n_queries))
+    rank = np.arange(len(query)) - starts[query]
+    ideal = np.zeros((n_queries, K))
+    inside = rank < K
+    ideal[query[inside], rank[inside]] = grade[inside]
+    counts = np.bincount(query, minlength=n_queries)
+    return ideal, counts
+
+
+# 2. Metrics for every cutoff
+def metrics_at_k(results, qrels):
+    """Mean Precision, Recall, MRR and nDCG at every k = 1..K (arrays of length K)."""
+    results = np.asarray(results)
+    n_queries, K = results.shape
+    rel = relevance_matrix(results, qrels)
+    ideal, n_relevant = _ideal_grades(qrels, n_queries, K)
+    judged = n_relevant > 0  # queries without relevant docs are left out of the means
+    ks = np.arange(1, K + 1)
+
+    hits = np.cumsum(rel > 0, axis=1)
+    precision = hits / ks
+    recall = hits[judged] / n_relevant[judged, np.newaxis]
+
+    has_hit = (rel > 0).any(axis=1)
+    first = np.where(has_hit, np.argmax(rel > 0, axis=1), K)
+    rr = np.where(first[:, np.newaxis] < ks, 1.0 / (first[:, np.newaxis] + 1), 0.0)
+
+    discount = 1 / np.log2(ks + 1)
+    dcg = np.cumsum((2 ** rel - 1) * discount, axis=1)
+    idcg = np.cumsum((2 ** ideal - 1) * discount, axis=1)
+    ndcg = dcg[judged] / idcg[judged]
+
+    return {
+        "k": ks,
+        "precision": precision[judged].mean(axis=0),
+        "recall": recall.mean(axis=0),
+        "mrr": rr[judged].mean(axis=0),
+        "ndcg": ndcg.mean(axis=0),
+        "n_queries": int(judged.sum()),
+    }
+
+
+# 3. Evaluation run with latency
+def latency_summary(seconds):
+    ms = np.asarray(seconds) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99]).tolist()
+    return {"mean_ms": float(ms.mean()), "p50_ms": p50, "p90_ms": p90, "p99_ms": p99,
+            "max_ms": float(ms.max())}
+
+
+def evaluate(search, queries, qrels, k=10, batch_size=1):
+    """Runs search(query_batch, k) -> ranked ids over all queries; returns metrics and latency.
+
+    With batch_size > 1 each query is charged its batch's time divided by the batch size.
+    """
+    results = np.full((len(queries), k), -1, dtype=np.int64)
+    latency = np.empty(len(queries))
+    for b0 in range(0, len(queries), batch_size):
+        batch = queries[b0:b0 + batch_size]
+        start = time.perf_counter()
+        ids = np.asarray(search(batch, k))
+        elapsed = time.perf_counter() - start
+        results[b0:b0 + len(batch), :ids.shape[1]] = ids
+        latency[b0:b0 + len(batch)] = elapsed / len(batch)
+    report = metrics_at_k(results, qrels)
+    report["latency"] = latency_summary(latency)
+    return report
+
+
+def format_report(report, ks=(1, 5, 10)):
+    ks = [k for k in ks if k <= len(report["k"])]
+    lines = ["metric     " + "".join(f"{'@' + str(k):>9}" for k in ks)]
+    for name in ("precision", "recall", "mrr", "ndcg"):
+        lines.append(f"{name:<11}" + "".join(f"{report[name][k - 1]:>9.4f}" for k in ks))
+    if "latency" in report:
+        lat = report["latency"]
+        lines.append(f"latency    p50 {lat['p50_ms']:.3f} ms  p90 {lat['p90_ms']:.3f} ms  "
+                     f"p99 {lat['p99_ms']:.3f} ms")
+    return "\n".join(lines)
+
+
+def compare(baseline, candidate, ks=(1, 5, 10)):
+    """Candidate minus baseline for every metric at ks, and for latency percentiles."""
+    ks = [k for k in ks if k <= min(len(baseline["k"]), len(candidate["k"]))]
+    delta = {name: {k: float(candidate[name][k - 1] - baseline[name][k - 1]) for k in ks}
+             for name in ("precision", "recall", "mrr", "ndcg")}
+    if "latency" in baseline and "latency" in candidate:
+        delta["latency"] = {p: candidate["latency"][p] - baseline["latency"][p]
+                            for p in ("p50_ms", "p90_ms", "p99_ms")}
+    return delta
+
+
+if __name__ == "__main__":
+    from vector_index import FlatIndex, IVFIndex
+
+    # Hand-checkable example: relevant docs {1, 3} for query 0 and {7} for query 1
+    results = np.array([[3, 5, 1, 9], [4, 8, 6, 7]])
+    qrels = qrels_from_lists([{1, 3}, {7}])
+    m = metrics_at_k(results, qrels)
+    print("P@k:", m["precision"], "R@k:", m["recall"], "MRR@k:", m["mrr"])
+
+    # Graded judgments: exact neighbours, closer ones graded higher
+    rng = np.random.default_rng(0)
+    dim, n = 64, 50000
+    centers = rng.standard_normal((300, dim)).astype(np.float32)
+    X = centers[rng.integers(0, 300, n)] + 1.2 * rng.standard_normal((n, dim)).astype(np.float32)
+    Q = centers[rng.integers(0, 300, 2000)] + 1.2 * rng.standard_normal((2000, dim)).astype(np.float32)
+    exact = FlatIndex(dim).add(X)
+    truth, _ = exact.search(Q, 10)
+    qrels = (np.repeat(np.arange(len(Q)), 10), truth.ravel(), np.tile(np.arange(3, 0, -0.3), len(Q)))
+
+    ivf = IVFIndex(dim, n_lists=224).train(X, n_iter=10).add(X)
+    reports = {}
+    for n_probe in (1, 8):
+        reports[n_probe] = evaluate(lambda q, k: ivf.search(q, k, n_probe=n_probe)[0], Q, qrels, k=10)
+        print(f"IVF n_probe={n_probe}\n{format_report(reports[n_probe])}")
+    print("n_probe 1 -> 8 deltas:", compare(reports[1], reports[8], ks=(10,)))
+
+    # Metric throughput for a large run
+    n_q, K = 50000, 100
+    results = rng.integers(0, 100000, (n_q, K))
+    qrels = (np.repeat(np.arange(n_q), 20), rng.integers(0, 100000, n_q * 20),
+             rng.integers(1, 4, n_q * 20))
+    start = time.perf_counter()
+    metrics_at_k(results, qrels)
+    print(f"All metrics @1..{K} for {n_q:,} queries: {time.perf_counter() - start:.2f} s")
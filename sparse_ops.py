@@ -0,0 +1,146 @@
+"""
+# Sparse Ops — Density-Aware Dot, Matvec, Matmul and Randomized SVD
+
+Day 9 uses dense NumPy arrays throughout, but user-item and bag-of-words
+matrices are usually more than 99% zeros. These entry points accept dense
+arrays or `scipy.sparse` CSR/CSC matrices and choose the kernel by density:
+
+- **density ≤ `DENSITY_THRESHOLD`**: sparse kernels (work ∝ non-zeros).
+- **denser input**: converted to a dense array so BLAS does the work; a
+  "sparse" matrix that is 40% full is slower through sparse kernels.
+
+`randomized_svd` computes a truncated SVD (Halko, Martinsson & Tropp)
+directly on the sparse matrix. It only needs products `A @ X` and `A.T @ Y`,
+so A is never densified. That is the matrix factorization mentioned in
+Day 9 Q17 for recommender systems.
+
+---
+"""
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+# Above this fraction of non-zeros, dense BLAS kernels win
+DENSITY_THRESHOLD = 0.1
+
+
+# 1. Density-based kernel selection
+def density(a):
+    """Fraction of non-zero entries."""
+    if sparse.issparse(a):
+        return a.nnz / max(1, a.shape[0] * a.shape[1])
+    a = np.asarray(a)
+    return np.count_nonzero(a) / max(1, a.size)
+
+
+def _prepare(a, threshold):
+    """Returns a in the representation its density calls for (CSR/CSC or ndarray)."""
+    if sparse.issparse(a):
+        if density(a) > threshold:
+            return a.toarray()
+        return a if a.format in ("csr", "csc") else a.tocsr()
+    return np.asarray(a)
+
+
+def dot(u, v):
+    """Dot product of two vectors, either of which may be a sparse 1×n or n×1 matrix."""
+    if sparse.issparse(u) or sparse.issparse(v):
+        su = sparse.csr_matrix(u).reshape(1, -1) if sparse.issparse(u) else None
+        sv = sparse.csr_matrix(v).reshape(1, -1) if sparse.issparse(v) else None
+        if su is not None and sv is not None:
+            return float(su.multiply(sv).sum())
+        sp, dense = (su, np.ravel(v)) if su is not None else (sv, np.ravel(u))
+        return float(sp.data @ dense[sp.indices])
+    return np.dot(u, v)
+
+
+def matvec(A, x, threshold=DENSITY_THRESHOLD):
+    """Computes A @ x with a sparse or dense kernel depending on A's density."""
+    A = _prepare(A, threshold)
+    x = np.asarray(x)
+    return A @ x
+
+
+def matmul(A, B, threshold=DENSITY_THRESHOLD, dense_output=None):
+    """Computes A @ B, choosing sparse or dense kernels from the operand densities."""
+    A = _prepare(A, threshold)
+    B = _prepare(B, threshold)
+    out = A @ B
+    if dense_output is None:
+        dense_output = not (sparse.issparse(A) and sparse.issparse(B))
+    if dense_output and sparse.issparse(out):
+        return out.toarray()
+    if not dense_output and not sparse.issparse(out):
+        return sparse.csr_matrix(out)
+    return out
+
+
+# 2. Randomized truncated SVD on sparse input
+def randomized_svd(A, k, oversample=10, n_iter=4, seed=0, init=None):
+    """Returns (U, s, Vt) of the top-k singular triplets, using only A @ X and A.T @ Y.
+
+    init (n × j) seeds the range finder with known right singular vectors (e.g. a
+    previous fit), padded with random columns; fewer power iterations are then needed.
+    """
+    rng = np.random.default_rng(seed)
+    A = A if sparse.issparse(A) else np.asarray(A, dtype=np.float64)
+    m, n = A.shape
+    p = min(k + oversample, m, n)
+
+    omega = rng.standard_normal((n, p))
+    if init is not None:
+        init = np.asarray(init, dtype=np.float64)[:, :p]
+        omega[:, :init.shape[1]] = init
+
+    # Range finder with power iterations, re-orthonormalized each step for stability
+    Q = A @ omega
+    Q, _ = np.linalg.qr(Q)
+    for _ in range(n_iter):
+        Z, _ = np.linalg.qr(A.T @ Q)
+        Q, _ = np.linalg.qr(A @ Z)
+
+    # Small SVD of the projected matrix B = Q.T @ A, formed as (A.T @ Q).T
+    B = np.asarray((A.T @ Q).T)
+    U_b, s, Vt = np.linalg.svd(B, full_matrices=False)
+    U = Q @ U_b
+    return U[:, :k], s[:k], Vt[:k]
+
+
+if __name__ == "__main__":
+    # Day 9 vectors and matrices, sparse and dense paths agree
+    v1 = np.array([1, 2, 3])
+    v2 = np.array([4, 5, 6])
+    print("Dot (dense):", dot(v1, v2), "(sparse):", dot(sparse.csr_matrix(v1), v2))
+    m1 = sparse.csr_matrix([[1, 2], [3, 4]])
+    m2 = np.array([[5, 6], [7, 8]])
+    print("m1 @ m2:\n", matmul(m1, m2))
+
+    # User-item matrix with 0.5% non-zeros: sparse vs dense kernels
+    rng = np.random.default_rng(0)
+    users, items = 20000, 5000
+    R = sparse.random(users, items, density=0.005, format="csr", random_state=0,
+                      data_rvs=lambda size: rng.integers(1, 6, size).astype(float))
+    x = rng.standard_normal(items)
+    print(f"Density: {density(R):.4f}")
+
+    start = time.perf_counter()
+    y_sparse = matvec(R, x)
+    t_sparse = time.perf_counter() - start
+    dense_R = R.toarray()
+    start = time.perf_counter()
+    y_dense = dense_R @ x
+    t_dense = time.perf_counter() - start
+    print(f"matvec sparse {t_sparse:.4f} s vs dense {t_dense:.4f} s, agree:",
+          np.allclose(y_sparse, y_dense))
+
+    start = time.perf_counter()
+    U, s, Vt = randomized_svd(R, k=10)
+    print("Randomized SVD (k=10):", round(time.perf_counter() - start, 3), "s")
+    # Accuracy check against a dense SVD of a sub-block
+    block = R[:4000, :1000]
+    s_exact = np.linalg.svd(block.toarray(), compute_uv=False)[:10]
+    s_check = randomized_svd(block, k=10, n_iter=10)[1]
+    print("Top-10 singular values, max relative error:",
+          np.max(np.abs(s_check - s_exact) / s_exact))
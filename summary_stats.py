@@ -0,0 +1,240 @@
+"""
+# Summary Statistics — One-Pass, Mergeable Descriptive Statistics
+
+Day 8 computes mean, median, mode, variance and standard deviation with five
+separate calls, each scanning the data again. `SummaryStats` computes all of
+them in **one pass over chunks**, and two accumulators built on different
+workers can be **merged**.
+
+## Components
+- **Count / mean / variance**: Welford's algorithm, merged across chunks and
+  workers with Chan's parallel formula (numerically stable).
+- **Median / quantiles**: a KLL-style compactor sketch. Items are kept
+  exactly until a level fills up; then half of them are promoted with double
+  weight. Small data (like the Day 8 `data` list) is therefore exact.
+- **Mode**: a Misra-Gries bounded counter. It is exact while the number of
+  distinct values fits in the capacity and keeps the heavy hitters otherwise.
+  Ties resolve to the smallest value, as `scipy.stats.mode` does.
+- NaN values are skipped and counted in `missing` (like `np.nanmean`).
+
+---
+"""
+
+import time
+
+import numpy as np
+
+
+# 1. Quantile sketch
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch; exact until the first compaction."""
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self._compress()
+
+    def merge(self, other):
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Halves every over-full level, promoting survivors with double weight."""
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self.k:
+                items = np.sort(items)
+                if len(items) % 2:
+                    keep, items = items[-1:], items[:-1]
+                else:
+                    keep = items[:0]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    @property
+    def exact(self):
+        return len(self.levels) == 1 or all(len(items) == 0 for items in self.levels[1:])
+
+    def quantile(self, q):
+        """Returns the q-quantile(s); matches np.quantile while the sketch is exact."""
+        if self.exact:
+            return np.quantile(self.levels[0], q) if len(self.levels[0]) else np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2.0 ** h)
+                                  for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items)
+        items, weights = items[order], weights[order]
+        # Midpoint rule: each item covers the centre of its weight span
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.interp(q, positions, items)
+
+
+# 2. Bounded mode counter
+class ModeCounter:
+    """Misra-Gries heavy-hitter counter, mergeable, exact below capacity distinct values."""
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.values = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, values):
+        values, counts = np.unique(np.asarray(values, dtype=np.float64), return_counts=True)
+        self._combine(values, counts)
+
+    def merge(self, other):
+        self._combine(other.values, other.counts)
+        return self
+
+    def _combine(self, values, counts):
+        merged = np.concatenate([self.values, values])
+        merged_counts = np.concatenate([self.counts, counts])
+        values, inverse = np.unique(merged, return_inverse=True)
+        counts = np.bincount(inverse, weights=merged_counts).astype(np.int64)
+        if len(values) > self.capacity:
+            # Subtract the (capacity+1)-th largest count and drop non-positive counters
+            cut = np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1]
+            counts = counts - cut
+            keep = counts > 0
+            values, counts = values[keep], counts[keep]
+        self.values, self.counts = values, counts
+
+    def mode(self):
+        """Returns (value, count); the smallest value wins ties."""
+        if not len(self.counts):
+            return np.nan, 0
+        best = np.argmax(self.counts)  # values are sorted, so first max is smallest
+        return self.values[best], int(self.counts[best])
+
+
+# 3. Summary accumulator
+class SummaryStats:
+    """One-pass count/mean/variance/min/max/quantiles/mode over chunks."""
+
+    def __init__(self, sketch_size=200, mode_capacity=1000, seed=0):
+        self.count = 0
+        self.missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(sketch_size, seed)
+        self.modes = ModeCounter(mode_capacity)
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        stats = cls(**kwargs)
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    def update(self, values):
+        """Folds one chunk of values into the summary."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        nan = np.isnan(values)
+        if nan.any():
+            self.missing += int(nan.sum())
+            values = values[~nan]
+        if not len(values):
+            return self
+        chunk_mean = values.mean()
+        self._combine_moments(len(values), chunk_mean, ((values - chunk_mean) ** 2).sum())
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.sketch.update(values)
+        self.modes.update(values)
+        return self
+
+    def merge(self, other):
+        """Merges another SummaryStats (e.g. from another worker) into this one."""
+        if other.count:
+            self._combine_moments(other.count, other.mean, other.m2)
+        self.missing += other.missing
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        self.modes.merge(other.modes)
+        return self
+
+    def _combine_moments(self, n_b, mean_b, m2_b):
+        """Chan's parallel update of (count, mean, M2)."""
+        total = self.count + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / total
+        self.m2 += m2_b + delta ** 2 * self.count * n_b / total
+        self.count = total
+
+    def variance(self, ddof=1):
+        return self.m2 / (self.count - ddof) if self.count > ddof else np.nan
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    @property
+    def mode(self):
+        return self.modes.mode()[0]
+
+    def summary(self, ddof=1):
+        return {
+            "count": self.count,
+            "missing": self.missing,
+            "mean": self.mean,
+            "median": self.median,
+            "mode": self.mode,
+            "variance": self.variance(ddof),
+            "std": self.std(ddof),
+            "min": self.min,
+            "max": self.max,
+            "range": self.max - self.min,
+        }
+
+
+if __name__ == "__main__":
+    from scipy import stats
+
+    # Day 8 data: one pass must match the five separate calls exactly
+    data = [12, 15, 12, 18, 22, 15, 18, 20, 16, 18, 17, 19, 21, 22, 14]
+    s = SummaryStats().update(data)
+    print(s.summary())
+    print("Matches numpy/scipy:",
+          np.isclose(s.mean, np.mean(data)), s.median == np.median(data),
+          s.mode == stats.mode(data).mode, np.isclose(s.variance(), np.var(data, ddof=1)),
+          np.isclose(s.std(), np.std(data, ddof=1)))
+
+    # Merging across "workers"
+    left, right = SummaryStats().update(data[:7]), SummaryStats().update(data[7:])
+    print("Merged equals single pass:", left.merge(right).summary() == s.summary())
+
+    # Large-data benchmark: one pass over chunks vs five full scans
+    rng = np.random.default_rng(0)
+    big = rng.normal(50, 10, size=10000000).round(1)
+
+    start = time.perf_counter()
+    s = SummaryStats.from_chunks(np.array_split(big, 20), sketch_size=2000)
+    print("One-pass accumulator:", round(time.perf_counter() - start, 3), "s")
+
+    start = time.perf_counter()
+    exact = (np.mean(big), np.median(big), stats.mode(big).mode,
+             np.var(big, ddof=1), np.std(big, ddof=1))
+    print("Five separate calls:", round(time.perf_counter() - start, 3), "s")
+    print("Sketch median:", s.median, "exact:", exact[1], "| mode:", s.mode, "exact:", exact[2])
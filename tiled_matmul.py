@@ -0,0 +1,164 @@
+"""
+# Tiled Matmul — Blocked Out-of-Core Matrix Multiplication
+
+Day 9's `m1 @ m2` needs both operands in memory. `tiled_matmul` multiplies
+matrices that live on disk (`np.memmap`, `.npy` files opened with
+`mmap_mode`, or anything that supports 2D slicing) one tile at a time.
+
+## How it works
+- The output is split into `tile × tile` blocks. Each output block is
+  `sum_k A[i, k] @ B[k, j]`, loading one input tile pair at a time.
+- The **tile size is chosen from available memory**: every worker holds an
+  A tile, a B tile, their product and an accumulator, so
+  `4 · tile² · itemsize` must fit in its share of `memory_fraction` of
+  `MemAvailable`. The worker count is resolved once and used both for this
+  share and for the pool.
+- Output blocks are independent, so they run in a **thread pool** (BLAS
+  releases the GIL) and are written straight into the output. Without
+  `out_path`, an output larger than the memory budget goes to a memmap in
+  a temporary file.
+- **Transpose case** `A.T @ B` (`transpose_a=True`) reads row-slabs of A and
+  transposes each small tile in memory; the full transpose is never built.
+  For the Gram pattern `A.T @ A` only the upper-triangular output blocks are
+  computed and mirrored.
+
+---
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# 1. Memory-aware tile size
+def available_memory():
+    """Returns available physical memory in bytes (MemAvailable on Linux)."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 1 << 30  # assume 1 GiB when the platform cannot tell us
+
+
+def resolve_workers(workers=None):
+    """Thread count to use; None means the ThreadPoolExecutor default, min(32, cpus + 4)."""
+    return workers or min(32, (os.cpu_count() or 1) + 4)
+
+
+def choose_tile(itemsize=8, workers=None, memory_fraction=0.25, max_tile=8192):
+    """Largest tile edge such that every worker's four tiles fit in its memory share."""
+    budget = available_memory() * memory_fraction / resolve_workers(workers)
+    tile = int(np.sqrt(budget / (4 * itemsize)))
+    return max(64, min(tile, max_tile))
+
+
+def _temp_memmap(shape, dtype):
+    """Output memmap in a temporary file; on POSIX the file is freed with the array."""
+    fd, path = tempfile.mkstemp(prefix="tiled_matmul_", suffix=".npy")
+    os.close(fd)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    try:
+        os.unlink(path)  # the mapping stays valid until the array is garbage collected
+    except OSError:
+        pass  # Windows cannot remove a mapped file; it stays in the temp directory
+    return out
+
+
+# 2. Tiled multiplication
+def tiled_matmul(A, B, out=None, out_path=None, transpose_a=False, tile=None,
+                 workers=None, memory_fraction=0.25, dtype=np.float64):
+    """Computes A @ B (or A.T @ B) tile by tile, writing into out, out_path or a new array.
+
+    Without out or out_path the result is in memory if it fits the memory
+    budget and a temporary-file memmap otherwise.
+    """
+    a_rows, a_cols = A.shape
+    m, inner = (a_cols, a_rows) if transpose_a else (a_rows, a_cols)
+    if B.shape[0] != inner:
+        op = "A.T @ B" if transpose_a else "A @ B"
+        raise ValueError(f"Inner dimensions do not align for {op}: {A.shape}, {B.shape}")
+    n = B.shape[1]
+    itemsize = np.dtype(dtype).itemsize
+    workers = resolve_workers(workers)
+
+    if out is None:
+        if out_path is not None:
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(m, n))
+        elif m * n * itemsize > available_memory() * memory_fraction:
+            out = _temp_memmap((m, n), dtype)
+        else:
+            out = np.empty((m, n), dtype=dtype)
+    elif out.shape != (m, n):
+        raise ValueError(f"out has shape {out.shape}, expected {(m, n)}")
+
+    tile = tile or choose_tile(itemsize, workers, memory_fraction)
+    gram = transpose_a and B is A
+
+    def a_tile(i0, i1, k0, k1):
+        if transpose_a:
+            return np.asarray(A[k0:k1, i0:i1], dtype=dtype).T
+        return np.asarray(A[i0:i1, k0:k1], dtype=dtype)
+
+    def compute(i0, j0):
+        i1, j1 = min(i0 + tile, m), min(j0 + tile, n)
+        acc = np.zeros((i1 - i0, j1 - j0), dtype=dtype)
+        for k0 in range(0, inner, tile):
+            k1 = min(k0 + tile, inner)
+            acc += a_tile(i0, i1, k0, k1) @ np.asarray(B[k0:k1, j0:j1], dtype=dtype)
+        out[i0:i1, j0:j1] = acc
+        if gram and i0 != j0:
+            out[j0:j1, i0:i1] = acc.T
+
+    blocks = [(i0, j0) for i0 in range(0, m, tile) for j0 in range(0, n, tile)
+              if not gram or j0 >= i0]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(compute, i0, j0) for i0, j0 in blocks]:
+            future.result()
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def gram_matrix(A, **kwargs):
+    """Returns A.T @ A (e.g. unnormalized feature covariance) without transposing A."""
+    return tiled_matmul(A, A, transpose_a=True, **kwargs)
+
+
+if __name__ == "__main__":
+    # Day 9 matrices
+    m1 = np.array([[1, 2], [3, 4]])
+    m2 = np.array([[5, 6], [7, 8]])
+    print("m1 @ m2:\n", tiled_matmul(m1, m2, tile=1))
+    print("m1.T @ m2:\n", tiled_matmul(m1, m2, transpose_a=True, tile=1))
+
+    print("Auto tile edge for float64:", choose_tile())
+
+    # Out-of-core run with memmapped operands and output
+    tmp = tempfile.mkdtemp(prefix="tiled_matmul_")
+    rng = np.random.default_rng(0)
+    rows, cols = 20000, 1500
+    A = np.lib.format.open_memmap(os.path.join(tmp, "A.npy"), mode="w+",
+                                  dtype=np.float64, shape=(rows, cols))
+    for r0 in range(0, rows, 5000):
+        A[r0:r0 + 5000] = rng.standard_normal((min(5000, rows - r0), cols))
+    A.flush()
+    A = np.load(os.path.join(tmp, "A.npy"), mmap_mode="r")
+
+    start = time.perf_counter()
+    G = gram_matrix(A, out_path=os.path.join(tmp, "gram.npy"), tile=512)
+    print("Tiled Gram A.T @ A:", round(time.perf_counter() - start, 3), "s")
+
+    start = time.perf_counter()
+    dense = np.asarray(A).T @ np.asarray(A)
+    print("In-memory A.T @ A:", round(time.perf_counter() - start, 3), "s")
+    print("Max abs difference:", np.max(np.abs(G - dense)))